@@ -1,6 +1,7 @@
+import threading
 from abc import ABCMeta, abstractmethod
 from functools import partialmethod
-from typing import List, Union
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -14,14 +15,17 @@ from .distinct_portfolio_evaluator import (
 from .inverse_pair_evaluator import calculate_inverse_pair
 from .log_mse_evaluator import calculate_log_mse
 from .neg_rank_ratio_evaluator import calculate_neg_rank_ratio
-from .portfolio_evaluator import calculate_portfolio_concentration
+from .portfolio_evaluator import (
+    calculate_portfolio_concentration,
+    calculate_portfolio_concentration_batch,
+)
 from .tau_evaluator import calculate_tau
 from .top_coverage_evaluator import (
     calculate_distinct_top_coverage,
     calculate_top_coverage,
 )
 from .woauc_evaluator import calculate_woauc
-from .wuauc_evaluator import calculate_wuauc
+from .wuauc_evaluator import calculate_wuauc, calculate_wuauc_batch
 
 
 class BaseCalculator(metaclass=ABCMeta):
@@ -44,10 +48,31 @@ class BaseCalculator(metaclass=ABCMeta):
     calculate_log_mse = partialmethod(calculate_log_mse)
     calculate_neg_rank_ratio = partialmethod(calculate_neg_rank_ratio)
     calculate_portfolio_concentration = partialmethod(calculate_portfolio_concentration)
+    calculate_portfolio_concentration_batch = partialmethod(
+        calculate_portfolio_concentration_batch
+    )
     calculate_tau = partialmethod(calculate_tau)
     calculate_top_coverage = partialmethod(calculate_top_coverage)
     calculate_woauc = partialmethod(calculate_woauc)
     calculate_wuauc = partialmethod(calculate_wuauc)
+    calculate_wuauc_batch = partialmethod(calculate_wuauc_batch)
+
+    # Attributes the overall score is computed from. Assigning any of them forgets the
+    # weights the current overall score was computed with and bumps `score_inputs_version`.
+    score_inputs: FrozenSet[str] = frozenset(
+        {
+            "df",
+            "selected_columns",
+            "selected_values",
+            "equation_type",
+            "equation_eval_str",
+            "equation_json",
+            "delimiter",
+            "rerank_eval_str",
+            "pca_calculator",
+        }
+    )
+    score_inputs_version: int = 0
 
     def __init__(self, selected_columns: List[str]) -> None:
         """Initializes the BaseCalculator."""
@@ -56,14 +81,54 @@ class BaseCalculator(metaclass=ABCMeta):
         self.samplers: dict = {}
         self.woauc_dict: dict = {}
         self.bin_mappings: dict = {}
+        self.overall_score_weights: Optional[Tuple[float, ...]] = None
+        # Held while the overall score is updated and evaluated, so objectives running
+        # trials in threads on this calculator do not interleave the two.
+        self.score_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Returns the attributes to pickle, leaving out the lock."""
+        state = self.__dict__.copy()
+        del state["score_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restores the pickled attributes with a new lock."""
+        self.__dict__.update(state)
+        self.score_lock = threading.Lock()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Sets an attribute, forgetting the overall score weights when a score input is assigned."""
+        if name in self.score_inputs:
+            super().__setattr__("overall_score_weights", None)
+            super().__setattr__("score_inputs_version", self.score_inputs_version + 1)
+        super().__setattr__(name, value)
 
     @abstractmethod
-    def get_overall_score(self, weights_for_equation: List[float]) -> None:
+    def get_overall_score(
+        self, weights_for_equation: Union[List[float], np.ndarray]
+    ) -> None:
         """
         Calculates the overall score based on the weights provided for each evaluation metric.
         """
         pass
 
+    def update_overall_score(
+        self, weights_for_equation: Union[List[float], np.ndarray]
+    ) -> None:
+        """
+        Calculates the overall score unless it was last calculated with the same weights.
+
+        Assigning one of the `score_inputs`, e.g. a new `df` or `equation_type`, forces the
+        next update to recalculate. Changes made inside the DataFrame are not tracked; call
+        `get_overall_score` to recalculate after them.
+
+        Args:
+            weights_for_equation (Union[List[float], np.ndarray]): The weights for each evaluation metric.
+        """
+        if tuple(weights_for_equation) != self.overall_score_weights:
+            self.get_overall_score(weights_for_equation)
+
     @staticmethod
     def clip_max(
         left: Union[np.ndarray, float, int], right: Union[np.ndarray, float, int]
@@ -79,7 +144,7 @@ class BaseCalculator(metaclass=ABCMeta):
         return np.clip(right, a_min=None, a_max=left)
 
     def initialize_local_dict(
-        self, weights_for_equation: List[float], columns: List
+        self, weights_for_equation: Union[List[float], np.ndarray], columns: List
     ) -> dict:
         """
         Initializes a dictionary that can be used for additional calculations.
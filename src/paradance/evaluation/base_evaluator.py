@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, cast
 
+import pandas as pd
+
 if TYPE_CHECKING:
     from .calculator import Calculator
 
@@ -8,6 +10,27 @@ R = TypeVar("R")
 F = Callable[..., R]
 
 
+def mask_dataframe(
+    calculator: "Calculator", mask_column: Optional[str]
+) -> pd.DataFrame:
+    """
+    Selects the rows of the calculator's dataframe that are kept by a mask column.
+
+    Args:
+        calculator (Calculator): The calculator holding the dataframe to be masked.
+        mask_column (Optional[str]): The column whose non-zero rows are kept. If None or missing
+            from the dataframe, every row is kept.
+
+    Returns:
+        pd.DataFrame: The masked dataframe.
+    """
+    if mask_column and mask_column in calculator.df.columns:
+        masked_indices = calculator.df[calculator.df[mask_column] != 0].index
+    else:
+        masked_indices = calculator.df.index
+    return calculator.df.loc[masked_indices]
+
+
 def evaluation_preprocessor(func: F) -> F:
     """
     A decorator to preprocess a dataframe before evaluation.
@@ -28,11 +51,7 @@ def evaluation_preprocessor(func: F) -> F:
         *args: Any,
         **kwargs: Any
     ) -> Any:
-        if mask_column and mask_column in calculator.df.columns:
-            masked_indices = calculator.df[calculator.df[mask_column] != 0].index
-        else:
-            masked_indices = calculator.df.index
-        calculator.evaluated_dataframe = calculator.df.loc[masked_indices]
+        calculator.evaluated_dataframe = mask_dataframe(calculator, mask_column)
         return func(calculator, target_column, *args, **kwargs)
 
     return cast(F, wrapper)
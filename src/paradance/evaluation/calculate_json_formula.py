@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -114,7 +114,7 @@ def calculate_row(
 def calculate_formula_scores(
     equation_json: JSONFormula,
     selected_values: pd.DataFrame,
-    weights: List[float],
+    weights: Union[List[float], np.ndarray],
     delimiter: Optional[str] = "#",
 ) -> pd.Series:
     """Calculates scores for each row in the DataFrame based on the provided formula JSON and weights.
@@ -122,7 +122,7 @@ def calculate_formula_scores(
     Args:
         equation_json (JSONFormula): The JSON formula object containing the expressions to calculate scores.
         data (pd.DataFrame): The data on which to apply the formula.
-        weights (List[float]): List of weights for tuning the calculations.
+        weights (Union[List[float], np.ndarray]): List of weights for tuning the calculations.
         delimiter (Optional[str], optional): Delimiter to split the keys in the formula. Defaults to '#'.
 
     Returns:
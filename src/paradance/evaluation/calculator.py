@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -16,8 +16,9 @@ class Calculator(BaseCalculator):
         equation_eval_str (Optional[str]): A string representing a custom equation to evaluate.
         equation_type (str): The type of equation to use for calculations ("product", "sum", "free_style", or "json").
         selected_columns (List[str]): Columns selected for calculations.
-        selected_values (np.ndarray): The values of the selected columns in the DataFrame.
+        selected_values (np.ndarray): The float64, column-major values of the selected columns in the DataFrame.
         value_scales (np.ndarray): The negative average log10 magnitude of absolute values for selected columns.
+        inverse_value_scales (np.ndarray): The reciprocals ``10 ** -value_scales`` of the value scales.
         weights_for_groups (pd.Series): A Series containing weights for different groups within the DataFrame.
     """
 
@@ -55,7 +56,11 @@ class Calculator(BaseCalculator):
 
         self.delimiter = delimiter
         self.equation_type = equation_type
-        self.selected_values = self.df[selected_columns].values
+        # Column-major so that per-row reductions over the few selected columns
+        # and per-column slices both stream over contiguous memory.
+        self.selected_values = np.asfortranarray(
+            self.df[selected_columns].to_numpy(dtype=np.float64)
+        )
 
         if weights_for_groups is None:
             self.weights_for_groups = pd.Series(
@@ -67,7 +72,7 @@ class Calculator(BaseCalculator):
     def value_scale(self) -> None:
         """
         Calculates the negative average log10 magnitude of absolute values for selected columns in the dataframe,
-        storing the result in `self.value_scales`.
+        storing the result in `self.value_scales` and its reciprocal powers of ten in `self.inverse_value_scales`.
         """
         dataframe = self.df[self.selected_columns].abs()
         magnitudes = np.log10(dataframe.values + 1e-10)
@@ -76,15 +81,16 @@ class Calculator(BaseCalculator):
         magnitudes = [-magnitude for magnitude in avg_magnitude]
 
         self.value_scales = np.asarray(magnitudes)
+        self.inverse_value_scales = np.power(10.0, -self.value_scales)
 
     def get_overall_score(
         self,
-        weights_for_equation: List[float],
+        weights_for_equation: Union[List[float], np.ndarray],
     ) -> None:
         """Calculates the overall score for each row in the DataFrame based on the specified equation type and weights.
 
         Args:
-            weights_for_equation (List[float]): A list of weights to apply to each selected column for the calculation.
+            weights_for_equation (Union[List[float], np.ndarray]): A list of weights to apply to each selected column for the calculation.
         """
         if self.equation_type == "product" and (
             len(weights_for_equation) == len(self.selected_columns)
@@ -93,7 +99,7 @@ class Calculator(BaseCalculator):
                 self.selected_values**weights_for_equation, axis=1
             )
         elif self.equation_type == "sum":
-            weights_array = np.array(weights_for_equation).reshape(-1, 1)
+            weights_array = np.asarray(weights_for_equation).reshape(-1, 1)
             self.df["overall_score"] = self.selected_values @ weights_array
 
         elif self.equation_type == "free_style":
@@ -126,6 +132,7 @@ class Calculator(BaseCalculator):
             )
 
         self.rerank_with_side_information()
+        self.overall_score_weights = tuple(weights_for_equation)
 
     def rerank_with_side_information(self) -> None:
         """Reranks the rows in the DataFrame based on side information.
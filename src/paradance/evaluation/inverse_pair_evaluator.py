@@ -2,66 +2,29 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from ..jit import njit
+
 if TYPE_CHECKING:
     from .calculator import Calculator
 
 
-def merge_and_count(
+# Integer codes of the weight types, as the merge kernel compiles without strings.
+_WEIGHT_TYPE_CODES = {"count": 0, "linear": 1, "exponential": 2}
+
+
+@njit(cache=True)
+def _merge_and_count_kernel(
     target_queue: np.ndarray,
     temporary_queue: np.ndarray,
     start_index: int,
     end_index: int,
-    weight_type: str,
+    weight_code: int,
 ) -> float:
     """
-    A helper function for the merge sort algorithm. It is used to merge two sorted
-    subarrays and count the inverse pairs based on the provided weights type.
-
-    :param target_queue: The original target scores to be sorted and merged.
-    :param temp_queue: A temporary array to store merged results.
-    :param left: The starting index of the portion to be merged.
-    :param right: The ending index of the portion to be merged.
-    :param weights_type: The type of weights used in calculating inverse pairs.
-    :return: The computed inverse pairs value for the merged segment.
+    Bottom-up merge sort of every row of `target_queue`, counting the inverse pairs
+    weighted by the weight type with code `weight_code`.
     """
-
-    def merge_ranges(
-        target_queue: np.ndarray,
-        temporary_queue: np.ndarray,
-        i: int,
-        j: int,
-        end: int,
-        weight_type: str,
-    ) -> float:
-        """
-        Helper function to merge two ranges and count inverse pairs based on the provided weights type.
-        """
-
-        result = 0.0
-        batch_size, _ = target_queue.shape
-
-        for k in range(batch_size):
-            idx_temporary, idx_left, idx_right = i, i, j
-            while idx_left < j and idx_right < end:
-                if target_queue[k, idx_left] >= target_queue[k, idx_right]:
-                    temporary_queue[k, idx_temporary] = target_queue[k, idx_left]
-                    idx_left += 1
-                else:
-                    temporary_queue[k, idx_temporary] = target_queue[k, idx_right]
-                    idx_right += 1
-                    if weight_type == "count":
-                        result += 1
-                    elif weight_type == "linear":
-                        result += (j - idx_left) * 0.5
-                    elif weight_type == "exponential":
-                        result += (j - idx_left) * (0.8**k)
-                idx_temporary += 1
-
-            temporary_queue[k, idx_temporary:j] = target_queue[k, idx_left:j]
-            temporary_queue[k, idx_temporary:end] = target_queue[k, idx_right:end]
-
-        return float(result)
-
+    batch_size = target_queue.shape[0]
     length = end_index - start_index
     step = 1
     result = 0.0
@@ -70,13 +33,60 @@ def merge_and_count(
         for i in range(start_index, end_index, 2 * step):
             j = min(i + step, end_index)
             end = min(j + step, end_index)
-            result += merge_ranges(
-                target_queue, temporary_queue, i, j, end, weight_type
-            )
+            for k in range(batch_size):
+                idx_temporary, idx_left, idx_right = i, i, j
+                while idx_left < j and idx_right < end:
+                    if target_queue[k, idx_left] >= target_queue[k, idx_right]:
+                        temporary_queue[k, idx_temporary] = target_queue[k, idx_left]
+                        idx_left += 1
+                    else:
+                        temporary_queue[k, idx_temporary] = target_queue[k, idx_right]
+                        idx_right += 1
+                        if weight_code == 0:
+                            result += 1
+                        elif weight_code == 1:
+                            result += (j - idx_left) * 0.5
+                        elif weight_code == 2:
+                            result += (j - idx_left) * (0.8**k)
+                    idx_temporary += 1
+
+                temporary_queue[k, idx_temporary:j] = target_queue[k, idx_left:j]
+                temporary_queue[k, idx_temporary:end] = target_queue[k, idx_right:end]
             target_queue[:, i:end] = temporary_queue[:, i:end]
         step *= 2
 
-    return float(result)
+    return result
+
+
+def merge_and_count(
+    target_queue: np.ndarray,
+    temporary_queue: np.ndarray,
+    start_index: int,
+    end_index: int,
+    weight_type: str,
+) -> float:
+    """
+    A helper function for the merge sort algorithm. It is used to merge two sorted
+    subarrays and count the inverse pairs based on the provided weights type.
+
+    The merge runs in a kernel compiled with numba when it is installed.
+
+    :param target_queue: The original target scores to be sorted and merged.
+    :param temp_queue: A temporary array to store merged results.
+    :param left: The starting index of the portion to be merged.
+    :param right: The ending index of the portion to be merged.
+    :param weights_type: The type of weights used in calculating inverse pairs.
+    :return: The computed inverse pairs value for the merged segment.
+    """
+    return float(
+        _merge_and_count_kernel(
+            target_queue,
+            temporary_queue,
+            start_index,
+            end_index,
+            _WEIGHT_TYPE_CODES.get(weight_type, -1),
+        )
+    )
 
 
 def calculate_inverse_pairs(
@@ -1,9 +1,12 @@
-from typing import List
+from typing import TYPE_CHECKING, List, Union
 
-from mixician import SelfBalancingLogarithmPCACalculator
+import numpy as np
 
 from .base_calculator import BaseCalculator
 
+if TYPE_CHECKING:
+    from mixician import SelfBalancingLogarithmPCACalculator
+
 
 class LogarithmPCACalculator(BaseCalculator):
     """A calculator for performing PCA (Principal Component Analysis) operations.
@@ -17,7 +20,7 @@ class LogarithmPCACalculator(BaseCalculator):
         df (DataFrame): A copy of the cleaned dataframe from the `pca_calculator`.
     """
 
-    def __init__(self, pca_calculator: SelfBalancingLogarithmPCACalculator):
+    def __init__(self, pca_calculator: "SelfBalancingLogarithmPCACalculator"):
         super().__init__(selected_columns=pca_calculator.selected_columns)
         self.pca_calculator = pca_calculator
         self.df = self.pca_calculator.clean_dataframe.copy()
@@ -26,7 +29,7 @@ class LogarithmPCACalculator(BaseCalculator):
 
     def get_overall_score(
         self,
-        weights_for_equation: List[float],
+        weights_for_equation: Union[List[float], np.ndarray],
     ) -> None:
         """
         Calculates and assigns an overall score to each entry in the dataframe based on
@@ -36,10 +39,11 @@ class LogarithmPCACalculator(BaseCalculator):
         that contains the calculated scores for each entry.
 
         Args:
-            weights_for_equation (List[float]): A list of weights for calculating the
+            weights_for_equation (Union[List[float], np.ndarray]): A list of weights for calculating the
                 overall PCA score.
         """
         self.pca_calculator.update(
             pca_weights=weights_for_equation,
         )
         self.df["overall_score"] = self.pca_calculator.cumulative_product_scores
+        self.overall_score_weights = tuple(weights_for_equation)
@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Optional, Tuple
 
+import numpy as np
+
 from .base_evaluator import evaluation_preprocessor
 
 if TYPE_CHECKING:
@@ -43,3 +45,78 @@ def calculate_portfolio_concentration(
     concentration = df[df["overall_score"] > threshold].shape[0] / len(df)
     concentration = 1 if concentration == 0 else concentration
     return threshold, concentration
+
+
+def compute_portfolio_concentrations(
+    scores: np.ndarray,
+    target_values: np.ndarray,
+    expected_returns: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the portfolio thresholds and concentrations for several expected returns at once.
+
+    The rows are sorted by score and the cumulative ratio of the target values is built a single
+    time. Every expected return is then resolved with a binary search, giving the same results as
+    calling `calculate_portfolio_concentration` once per expected return.
+
+    Args:
+        scores: The overall scores of the rows.
+        target_values: The target values of the same rows.
+        expected_returns: The expected cumulative ratios to resolve.
+
+    Returns:
+        A tuple containing:
+        - thresholds (np.ndarray): The score thresholds, one per expected return.
+        - concentrations (np.ndarray): The proportions of data points above each threshold.
+    """
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    sorted_targets = np.asarray(target_values[order], dtype=np.float64)
+    cumulative_ratio = np.cumsum(sorted_targets)
+    # Divide by the pairwise sum like pandas does, not by the last cumulative sum,
+    # so that ratios near 1 round exactly as in `calculate_portfolio_concentration`.
+    cumulative_ratio /= sorted_targets.sum()
+    # The first row whose cumulative ratio exceeds the expected return holds the
+    # threshold. The running maximum keeps the search valid for negative targets.
+    first_above = np.searchsorted(
+        np.maximum.accumulate(cumulative_ratio),
+        np.asarray(expected_returns, dtype=np.float64),
+        side="right",
+    )
+    thresholds = np.full(len(first_above), np.nan)
+    found = first_above < len(sorted_scores)
+    thresholds[found] = sorted_scores[first_above[found]]
+    above_counts = np.zeros(len(first_above), dtype=np.int64)
+    above_counts[found] = np.searchsorted(
+        -sorted_scores, -thresholds[found], side="left"
+    )
+    concentrations = above_counts / len(sorted_scores)
+    concentrations[concentrations == 0] = 1
+    return thresholds, concentrations
+
+
+@evaluation_preprocessor
+def calculate_portfolio_concentration_batch(
+    calculator: "Calculator",
+    target_column: str,
+    expected_returns: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the portfolio thresholds and concentrations for several expected returns at once.
+
+    Args:
+        calculator: An instance of Calculator, expected to contain a DataFrame.
+        target_column: The column name in the DataFrame for which concentration is calculated.
+        expected_returns: The expected cumulative ratios to resolve.
+
+    Returns:
+        A tuple containing:
+        - thresholds (np.ndarray): The 'overall_score' thresholds, one per expected return.
+        - concentrations (np.ndarray): The proportions of data points above each threshold.
+    """
+    df = calculator.evaluated_dataframe
+    return compute_portfolio_concentrations(
+        df["overall_score"].to_numpy(),
+        df[target_column].to_numpy(),
+        expected_returns,
+    )
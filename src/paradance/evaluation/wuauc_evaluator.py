@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, List, Optional
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -7,7 +8,7 @@ from sklearn.metrics import roc_auc_score
 if TYPE_CHECKING:
     from .calculator import Calculator
 
-from .base_evaluator import evaluation_preprocessor
+from .base_evaluator import evaluation_preprocessor, mask_dataframe
 
 
 @evaluation_preprocessor
@@ -41,3 +42,61 @@ def calculate_wuauc(
             else:
                 result = float(np.mean(grouped))
     return result
+
+
+def calculate_wuauc_batch(
+    calculator: "Calculator",
+    target_columns: List[str],
+    mask_columns: List[Optional[str]],
+    groupbys: List[Optional[str]],
+    weights_for_groups: List[Optional[pd.Series]],
+    auc: bool = False,
+) -> List[float]:
+    """Calculate several AUC/WUAUC values at once.
+
+    Evaluators sharing a mask column reuse one masked dataframe, and evaluators that
+    also share a groupby column are scored in a single ``groupby`` pass.
+
+    :param target_columns: label columns, one per evaluator
+    :param mask_columns: mask columns, one per evaluator
+    :param groupbys: groupby columns, one per evaluator
+    :param weights_for_groups: weights for groups, one per evaluator
+    :param auc: bool, optional, default: False
+    :return: AUC/WUAUC/UAUC values in the order of `target_columns`
+    """
+    results = [0.0] * len(target_columns)
+    plans: Dict[Tuple[Optional[str], Optional[str]], List[int]] = defaultdict(list)
+    for i, (mask_column, groupby) in enumerate(zip(mask_columns, groupbys)):
+        if not auc and groupby is None:
+            raise ValueError("groupby must be provided to calculate WUAUC.")
+        plans[(mask_column, None if auc else groupby)].append(i)
+
+    masked_dataframes: Dict[Optional[str], pd.DataFrame] = {}
+    for (mask_column, groupby), indices in plans.items():
+        if mask_column not in masked_dataframes:
+            masked_dataframes[mask_column] = mask_dataframe(calculator, mask_column)
+        df = masked_dataframes[mask_column]
+        if groupby is None:
+            for i in indices:
+                results[i] = float(
+                    roc_auc_score(df[target_columns[i]].values, df["overall_score"])
+                )
+            continue
+
+        columns = [target_columns[i] for i in indices]
+        grouped = df.groupby(groupby).apply(
+            lambda x: pd.Series(
+                [float(roc_auc_score(x[c], x["overall_score"])) for c in columns]
+            )
+        )
+        for position, i in enumerate(indices):
+            group_scores = grouped[position]
+            group_weights = weights_for_groups[i]
+            if group_weights is not None:
+                counts_sorted = group_weights.loc[group_scores.index]
+                results[i] = float(
+                    np.average(group_scores, weights=counts_sorted.values)
+                )
+            else:
+                results[i] = float(np.mean(group_scores))
+    return results
@@ -0,0 +1,49 @@
+from typing import Any, Callable, Iterable, TypeVar, Union, cast, overload
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+try:
+    from numba import njit as _numba_njit
+    from numba import prange as _numba_prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# ``numba.prange`` when numba is installed, so kernels parallelize their loops, and
+# the builtin ``range`` otherwise.
+prange: Callable[..., Iterable[int]] = _numba_prange if NUMBA_AVAILABLE else range
+
+
+@overload
+def njit(func: F) -> F: ...
+
+
+@overload
+def njit(func: None = None, **kwargs: Any) -> Callable[[F], F]: ...
+
+
+def njit(func: Any = None, **kwargs: Any) -> Union[F, Callable[[F], F]]:
+    """
+    Compiles a function with ``numba.njit`` when numba is installed.
+
+    Numba is an optional extra (``pip install paradance[numba]``). Without it the
+    decorated function is returned unchanged and runs as plain Python/NumPy, so
+    every kernel decorated here must also be valid outside of nopython mode.
+
+    Args:
+        func (Optional[Callable]): The function to compile when used as ``@njit``.
+        **kwargs: Options forwarded to ``numba.njit`` when used as ``@njit(...)``.
+
+    Returns:
+        Callable: The compiled function, or a decorator producing it.
+    """
+
+    def decorator(function: F) -> F:
+        if not NUMBA_AVAILABLE:
+            return function
+        return cast(F, _numba_njit(**kwargs)(function))
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -5,9 +5,10 @@ from typing import Dict, List, Optional, Union
 
 import numpy as np
 import optuna
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from ..evaluation import Calculator, LogarithmPCACalculator
+from .get_processors import get_logical_processors_count
 from .set_path import ensure_study_directory
 
 
@@ -15,6 +16,9 @@ class BaseObjectiveConfig(BaseModel):
     """
     Base configuration class for defining optimization objectives.
 
+    Configurations are frozen: an objective copies the fields it needs when it is built,
+    so a configuration cannot be changed afterwards.
+
     Attributes:
         direction (Optional[str]): Specifies the optimization direction. This can be either 'minimize' or 'maximize'.
                                    Default is None, which should be overridden in subclass or instance.
@@ -29,8 +33,20 @@ class BaseObjectiveConfig(BaseModel):
         study_path (Optional[str]): Filesystem path where study results are stored. Default is None.
         save_study (Optional[bool]): Flag indicating whether to persist the study to disk. Defaults to True.
         entry_point_path (Optional[str]): Path to the entry point for the optimization process. Default is None.
+        n_jobs (int): The number of threads `optimize` runs trials in. -1 uses every logical processor. Trials on
+                      one calculator evaluate their weights one at a time, so the threads only overlap the
+                      sampling and storage work of Optuna. Defaults to 1.
+        storage (Optional[str]): Where the study is stored. None keeps it in the SQLite file
+                                 `paradance_storage.db` of the study directory, "journal" in the append-only
+                                 journal file `paradance_journal.log` next to it, "memory" keeps it in memory
+                                 and any other value is used as an RDB URL, e.g. a MySQL or PostgreSQL server.
+                                 SQLite serializes writes, so many parallel workers contend on the file lock;
+                                 the journal file only appends under a short lock. An in-memory study cannot
+                                 be shared with the worker processes of `optimize_run`. Default is None.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     direction: Optional[str] = None
     formula: Optional[str] = None
     warmup_formula: Optional[str] = None
@@ -43,6 +59,8 @@ class BaseObjectiveConfig(BaseModel):
     study_path: Optional[str] = None
     save_study: Optional[bool] = True
     entry_point_path: Optional[str] = None
+    n_jobs: int = 1
+    storage: Optional[str] = None
 
 
 class BaseObjective(metaclass=ABCMeta):
@@ -61,9 +79,12 @@ class BaseObjective(metaclass=ABCMeta):
         weights_num (Optional[int]): Number of weights for optimization.
         study_name (Optional[str]): Name of the study.
         study_path (Optional[str]): Path to the study directory.
+        n_jobs (int): Number of threads to run trials in, -1 for all processors.
+        storage (Optional[str]): None for the SQLite file of the study, "journal", "memory" or an RDB URL.
         full_path (str): Full path combining study_path and study_name.
         study (Study): Optuna study object for optimization.
         logger (logging.Logger): Logger object for logging optimization progress.
+        info_logger (Optional[logging.Logger]): `logger` if it emits INFO records when it is built, otherwise None.
 
     Methods:
         build_logger(process_id) -> None:
@@ -74,6 +95,31 @@ class BaseObjective(metaclass=ABCMeta):
             Optimize the objective for a specified number of trials.
     """
 
+    __slots__ = (
+        "__weakref__",
+        "calculator",
+        "config",
+        "direction",
+        "formula",
+        "warmup_formula",
+        "warmup_trials",
+        "first_order",
+        "power",
+        "dirichlet",
+        "weights_num",
+        "study_name",
+        "study_path",
+        "save_study",
+        "entry_point_path",
+        "n_jobs",
+        "storage",
+        "info_logger",
+        "full_path",
+        "study",
+        "best_params",
+        "logger",
+    )
+
     def __init__(
         self,
         calculator: Union[Calculator, LogarithmPCACalculator],
@@ -89,6 +135,8 @@ class BaseObjective(metaclass=ABCMeta):
         study_path: Optional[str] = None,
         save_study: Optional[bool] = True,
         entry_point_path: Optional[str] = None,
+        n_jobs: int = 1,
+        storage: Optional[str] = None,
         config: Optional[Dict] = None,
     ) -> None:
         """
@@ -104,6 +152,9 @@ class BaseObjective(metaclass=ABCMeta):
             dirichlet (bool, optional): Use Dirichlet distribution. Defaults to False.
             study_name (Optional[str], optional): Name of the study. Defaults to None.
             study_path (Optional[str], optional): Path to the study directory. Defaults to None.
+            n_jobs (int, optional): Number of threads to run trials in, -1 for all processors. Defaults to 1.
+            storage (Optional[str], optional): None for the SQLite file of the study, "journal" for its
+                journal file, "memory" or an RDB URL. Defaults to None.
         """
         self.calculator = calculator
         if config is not None:
@@ -122,6 +173,8 @@ class BaseObjective(metaclass=ABCMeta):
                 study_path=study_path,
                 save_study=save_study,
                 entry_point_path=entry_point_path,
+                n_jobs=n_jobs,
+                storage=storage,
             )
 
         self.direction = self.config.direction
@@ -136,6 +189,9 @@ class BaseObjective(metaclass=ABCMeta):
         self.study_path = self.config.study_path
         self.save_study = self.config.save_study
         self.entry_point_path = self.config.entry_point_path
+        self.n_jobs = self.config.n_jobs
+        self.storage = self.config.storage
+        self.info_logger: Optional[logging.Logger] = None
         self._prepare_study()
 
     def _prepare_study(self) -> None:
@@ -148,7 +204,7 @@ class BaseObjective(metaclass=ABCMeta):
 
         Side effects:
             - Creates or ensures the existence of a directory for the study.
-            - Initializes or loads an Optuna study with the specified configuration.
+            - Initializes or loads an Optuna study in the configured `storage`, by default the SQLite file of the study.
             - Updates `self.full_path` with the path to the study directory.
             - Initializes `self.study` with the created or loaded Optuna study.
             - Determines `self.weights_num` if it is not already specified.
@@ -161,10 +217,22 @@ class BaseObjective(metaclass=ABCMeta):
         else:
             storage_path = self.full_path
 
-        storage = optuna.storages.RDBStorage(
-            url=f"sqlite:///{storage_path}/paradance_storage.db",
-            engine_kwargs={"connect_args": {"timeout": 120}},
-        )
+        storage: Union[str, optuna.storages.BaseStorage]
+        if self.storage is None:
+            storage = optuna.storages.RDBStorage(
+                url=f"sqlite:///{storage_path}/paradance_storage.db",
+                engine_kwargs={"connect_args": {"timeout": 120}},
+            )
+        elif self.storage == "journal":
+            storage = optuna.storages.JournalStorage(
+                optuna.storages.JournalFileStorage(
+                    f"{storage_path}/paradance_journal.log"
+                )
+            )
+        elif self.storage == "memory":
+            storage = optuna.storages.InMemoryStorage()
+        else:
+            storage = self.storage
 
         self.study = optuna.create_study(
             direction=self.direction,
@@ -190,23 +258,36 @@ class BaseObjective(metaclass=ABCMeta):
         else:
             log_filename = f"{self.full_path}/paradance.log"
 
-        file_handler = logging.FileHandler(log_filename)
-        file_handler.setLevel(logging.INFO)
         self.logger = optuna.logging.get_logger(
             f"paradance_{process_id}" if process_id else "optuna"
         )
-        self.logger.addHandler(file_handler)
+        # Workers sharing the process, e.g. the threads of `optimize_run`, log through the
+        # same logger, so each log file gets a single handler.
+        log_path = os.path.abspath(log_filename)
+        if not any(
+            isinstance(handler, logging.FileHandler)
+            and handler.baseFilename == log_path
+            for handler in self.logger.handlers
+        ):
+            file_handler = logging.FileHandler(log_filename)
+            file_handler.setLevel(logging.INFO)
+            self.logger.addHandler(file_handler)
+        self.info_logger = (
+            self.logger if self.logger.isEnabledFor(logging.INFO) else None
+        )
 
     @abstractmethod
-    def evaluate_custom_weights(self, weights: List[float]) -> List[float]:
+    def evaluate_custom_weights(
+        self, weights: Union[List[float], np.ndarray]
+    ) -> np.ndarray:
         """
         Evaluates the custom weights for the given list of weights.
 
         Args:
-            weights (List[float]): List of weights to evaluate.
+            weights (Union[List[float], np.ndarray]): List of weights to evaluate.
 
         Returns:
-            float: Evaluation score for the given weights.
+            np.ndarray: Evaluation scores for the given weights.
         """
         raise NotImplementedError
 
@@ -232,12 +313,65 @@ class BaseObjective(metaclass=ABCMeta):
         """
         return len(self.calculator.selected_columns)
 
-    def optimize(self, n_trials: int) -> None:
+    def optimize(self, n_trials: int, batch_size: Optional[int] = None) -> None:
         """
         Optimizes the objective for a set number of trials.
 
+        Trials run in `n_jobs` threads sharing this process. The evaluation of a trial holds
+        the `score_lock` of the calculator, which stores the overall score, so the threads
+        only overlap the sampling and storage work of Optuna; use `optimize_run` to spread
+        the evaluations over processes instead.
+
         Args:
             n_trials (int): Number of trials for optimization.
+            batch_size (Optional[int], optional): If set, trials are asked from the study `batch_size` at a time
+                and told back once evaluated, instead of running `study.optimize`. Defaults to None.
         """
         self.build_logger()
-        self.study.optimize(self.objective, n_trials=n_trials)
+        if batch_size is not None:
+            self._optimize_in_batches(n_trials, batch_size)
+            return
+        n_jobs = get_logical_processors_count() if self.n_jobs == -1 else self.n_jobs
+        self.study.optimize(self.objective, n_trials=n_trials, n_jobs=n_jobs)
+
+    def _optimize_in_batches(self, n_trials: int, batch_size: int) -> None:
+        """
+        Optimizes the objective through the ask-and-tell interface of the study.
+
+        Completed trials are logged in the same format as `study.optimize`, which
+        `get_best_trials` relies on.
+
+        Args:
+            n_trials (int): Number of trials for optimization.
+            batch_size (int): Number of trials asked from the study at once.
+        """
+        study = self.study
+        objective = self.objective
+        for start in range(0, n_trials, batch_size):
+            trials = [study.ask() for _ in range(min(batch_size, n_trials - start))]
+            for index, trial in enumerate(trials):
+                try:
+                    value = objective(trial)
+                except optuna.TrialPruned:
+                    study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+                    continue
+                except Exception:
+                    for unfinished_trial in trials[index:]:
+                        study.tell(unfinished_trial, state=optuna.trial.TrialState.FAIL)
+                    raise
+                frozen_trial = study.tell(trial, value)
+                info_logger = self.info_logger
+                if (
+                    info_logger is not None
+                    and frozen_trial.state == optuna.trial.TrialState.COMPLETE
+                ):
+                    best_trial = study.best_trial
+                    info_logger.info(
+                        "Trial %d finished with value: %s and parameters: %s. "
+                        "Best is trial %d with value: %s.",
+                        frozen_trial.number,
+                        value,
+                        frozen_trial.params,
+                        best_trial.number,
+                        best_trial.value,
+                    )
@@ -1,160 +1,255 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable, Dict, Optional, cast
 
 import numpy as np
 import optuna
 
 from ..evaluation import Calculator
+from ..jit import njit
 
 if TYPE_CHECKING:
     from .multiple_objective import MultipleObjective
 
+# The trial user attribute recording the Dirichlet weights built from the suggested fractions.
+DIRICHLET_WEIGHTS_ATTR = "dirichlet_weights"
+
+
+@njit(cache=True)
+def _dirichlet_from_fractions(fractions: np.ndarray, floor: float = 0.1) -> np.ndarray:
+    """
+    Turns stick-breaking fractions into Dirichlet weights that sum to one.
+
+    The i-th weight takes ``fractions[i]`` of the remaining stick, which is never
+    taken as less than ``floor``; the last weight receives whatever is left.
+
+    Args:
+        fractions (np.ndarray): Fractions in [0, 1], one per weight except the last.
+        floor (float, optional): Lower bound of the remaining stick. Defaults to 0.1.
+
+    Returns:
+        np.ndarray: The ``len(fractions) + 1`` Dirichlet weights.
+    """
+    n = fractions.shape[0]
+    weights = np.empty(n + 1)
+    acc = 0.0
+    for i in range(n):
+        weights[i] = fractions[i] * max(1.0 - acc, floor)
+        acc += weights[i]
+    weights[n] = 1.0 - acc
+    return weights
+
 
 def construct_power_weights(
-    ob: "MultipleObjective", trial: optuna.Trial
-) -> List[float]:
+    ob: "MultipleObjective", trial: optuna.Trial, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Construct power weights based on the attributes of the MultipleObjective instance and the current trial.
 
+    With `dirichlet` set, the trial suggests one stick-breaking fraction per Dirichlet weight
+    except the last, named ``w_po_frac_1, w_po_frac_2, ...``. The Dirichlet weights built from
+    them precede the power weights and are recorded in the `DIRICHLET_WEIGHTS_ATTR` user
+    attribute of the trial.
+
     Args:
         ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the power weights.
         trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
+        out (Optional[np.ndarray], optional): A buffer to write the weights into, of length `2 * weights_num` if
+            `dirichlet` is set and `weights_num` otherwise. Defaults to None, which allocates a new array.
 
     Returns:
-        List[float]: A list of power weights constructed based on the given MultipleObjective instance and the current trial.
+        np.ndarray: The power weights constructed based on the given MultipleObjective instance and the current trial.
     """
-    power_weights: List[float] = []
     if ob.weights_num is None:
         ob.weights_num = ob.get_weights_num()
+    weights_num = ob.weights_num
+    power_lower_bound = ob.power_lower_bound
+    power_upper_bound = ob.power_upper_bound
+    weight_names = ob.weight_names
+    dirichlet_fraction_names = ob.dirichlet_fraction_names
+    suggest_float = trial.suggest_float
+    offset = weights_num if ob.dirichlet else 0
+    if out is None:
+        out = np.empty(offset + weights_num)
 
     if ob.dirichlet:
-        for i in range(ob.weights_num - 1):
-            power_weights.append(
-                trial.suggest_float(
-                    f"w_po_{i+1}", 0, max((1 - sum(power_weights), 0.1))
-                )
-            )
-        power_weights.append(1 - sum(power_weights))
+        fractions = np.array(
+            [
+                suggest_float(dirichlet_fraction_names[i], 0, 1)
+                for i in range(weights_num - 1)
+            ]
+        )
+        out[:offset] = _dirichlet_from_fractions(fractions)
+        trial.set_user_attr(DIRICHLET_WEIGHTS_ATTR, out[:offset].tolist())
 
     lower_bounds = (
-        [ob.power_lower_bound] * ob.weights_num
-        if isinstance(ob.power_lower_bound, float)
-        else ob.power_lower_bound
+        [power_lower_bound] * weights_num
+        if isinstance(power_lower_bound, float)
+        else power_lower_bound
     )
     upper_bounds = (
-        [ob.power_upper_bound] * ob.weights_num
-        if isinstance(ob.power_upper_bound, float)
-        else ob.power_upper_bound
+        [power_upper_bound] * weights_num
+        if isinstance(power_upper_bound, float)
+        else power_upper_bound
     )
 
-    for i in range(ob.weights_num):
-        power_weights.append(
-            trial.suggest_float(f"w{i+1}", lower_bounds[i], upper_bounds[i])
+    for i in range(weights_num):
+        out[offset + i] = suggest_float(
+            weight_names[i], lower_bounds[i], upper_bounds[i]
         )
 
-    return power_weights
+    return out
 
 
-def construct_first_order_weights(
-    ob: "MultipleObjective", trial: optuna.Trial
-) -> List[float]:
+def construct_scaled_first_order_weights(
+    ob: "MultipleObjective", trial: optuna.Trial, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
-    Construct first order weights based on the attributes of the MultipleObjective instance and the current trial.
+    Construct first order weights whose bounds follow the value scales of the calculator.
 
     Args:
         ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the first order weights.
         trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
+        out (Optional[np.ndarray], optional): A buffer of length `weights_num` to write the weights into. Defaults to None,
+            which allocates a new array.
 
     Returns:
-        List[float]: A list of first order weights constructed based on the given MultipleObjective instance and the current trial.
+        np.ndarray: The first order weights constructed based on the given MultipleObjective instance and the current trial.
+    """
+    if ob.weights_num is None:
+        ob.weights_num = ob.get_weights_num()
+    weights_num = ob.weights_num
+    first_order_weight_names = ob.first_order_weight_names
+    suggest_float = trial.suggest_float
+    if out is None:
+        out = np.empty(weights_num)
+
+    calculator = cast(Calculator, ob.calculator)
+    value_scales = calculator.value_scales
+    lower_bounds = np.power(
+        10, value_scales - np.asarray(ob.first_order_scale_lower_bound)
+    ).tolist()
+    upper_bounds = np.power(
+        10, value_scales + np.asarray(ob.first_order_scale_upper_bound)
+    ).tolist()
+    for i in range(weights_num):
+        out[i] = suggest_float(
+            first_order_weight_names[i],
+            lower_bounds[i],
+            upper_bounds[i],
+            log=False,
+        )
+    max_min_scale_ratio = ob.max_min_scale_ratio
+    if max_min_scale_ratio is not None:
+        scales_with_weights = out * calculator.inverse_value_scales
+        scales_with_weights_ratio = scales_with_weights.max() / (
+            scales_with_weights.min() + 1e-6
+        )
+        out *= max_min_scale_ratio / scales_with_weights_ratio
+
+    return out
+
+
+def construct_unscaled_first_order_weights(
+    ob: "MultipleObjective", trial: optuna.Trial, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
-    first_order_weights: List[float] = []
-    log = ob.first_order_lower_bound >= 0
+    Construct first order weights within the fixed first order bounds.
 
+    Args:
+        ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the first order weights.
+        trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
+        out (Optional[np.ndarray], optional): A buffer of length `weights_num` to write the weights into. Defaults to None,
+            which allocates a new array.
+
+    Returns:
+        np.ndarray: The first order weights constructed based on the given MultipleObjective instance and the current trial.
+    """
     if ob.weights_num is None:
         ob.weights_num = ob.get_weights_num()
+    weights_num = ob.weights_num
+    first_order_weight_names = ob.first_order_weight_names
+    suggest_float = trial.suggest_float
+    if out is None:
+        out = np.empty(weights_num)
+
+    first_order_lower_bound = ob.first_order_lower_bound
+    first_order_upper_bound = ob.first_order_upper_bound
+    log = ob.first_order_log_scale
+    for i in range(weights_num):
+        out[i] = suggest_float(
+            first_order_weight_names[i],
+            first_order_lower_bound,
+            first_order_upper_bound,
+            log=log,
+        )
 
-    first_order_scale_upper_bound = ob.first_order_scale_upper_bound
-    first_order_scale_lower_bound = ob.first_order_scale_lower_bound
+    return out
 
-    if isinstance(ob.calculator, Calculator) and ob.first_order_with_scales:
-        value_scales = ob.calculator.value_scales
-        for i in range(ob.weights_num):
-            first_order_weights.append(
-                trial.suggest_float(
-                    f"w_fo_{i+1}",
-                    np.power(10, value_scales[i] - first_order_scale_lower_bound),
-                    np.power(10, value_scales[i] + first_order_scale_upper_bound),
-                    log=False,
-                )
-            )
-        if ob.max_min_scale_ratio is not None:
-            scales_with_weights = [
-                weight * np.power(10, -value_scale)
-                for weight, value_scale in zip(first_order_weights, value_scales)
-            ]
-            scales_with_weights_ratio = max(scales_with_weights) / (
-                min(scales_with_weights) + 1e-6
-            )
-            first_order_weights = [
-                weight * ob.max_min_scale_ratio / scales_with_weights_ratio
-                for weight in first_order_weights
-            ]
-    else:
-        for i in range(ob.weights_num):
-            first_order_weights.append(
-                trial.suggest_float(
-                    f"w_fo_{i+1}",
-                    ob.first_order_lower_bound,
-                    ob.first_order_upper_bound,
-                    log=log,
-                )
-            )
 
-    return first_order_weights
+FirstOrderConstructor = Callable[
+    ["MultipleObjective", optuna.Trial, Optional[np.ndarray]], np.ndarray
+]
+
+
+def select_first_order_constructor(ob: "MultipleObjective") -> FirstOrderConstructor:
+    """
+    Select the first order weight constructor matching the calculator of the MultipleObjective instance.
+
+    Args:
+        ob (MultipleObjective): An instance of the MultipleObjective class.
+
+    Returns:
+        FirstOrderConstructor: `construct_scaled_first_order_weights` if the calculator is a Calculator and
+        `first_order_with_scales` is set, otherwise `construct_unscaled_first_order_weights`.
+    """
+    if isinstance(ob.calculator, Calculator) and ob.first_order_with_scales:
+        return construct_scaled_first_order_weights
+    return construct_unscaled_first_order_weights
 
 
 def construct_free_style_weights(
     ob: "MultipleObjective", trial: optuna.Trial
-) -> List[float]:
-    """Constructs a list of free-style weights for a given multiple objective.
+) -> np.ndarray:
+    """Constructs an array of free-style weights for a given multiple objective.
 
     Args:
         ob (MultipleObjective): The multiple objective instance with the weight configurations.
         trial (optuna.Trial): The optuna trial object used to suggest the weights.
 
     Returns:
-        List[float]: A list of weights suggested by the optuna trial.
+        np.ndarray: The weights suggested by the optuna trial.
     """
-    free_style_weights: List[float] = []
     if ob.weights_num is None:
         ob.weights_num = ob.get_weights_num()
+    weights_num = ob.weights_num
+    free_style_weights = np.empty(weights_num)
+    weight_names = ob.weight_names
+    suggest_float = trial.suggest_float
     if ob.base_weights is not None:
+        base_weights_offset_ratio = ob.base_weights_offset_ratio
         ob.free_style_lower_bound = [
-            (1 - ob.base_weights_offset_ratio) * weight for weight in ob.base_weights
+            (1 - base_weights_offset_ratio) * weight for weight in ob.base_weights
         ]
         ob.free_style_upper_bound = [
-            (1 + ob.base_weights_offset_ratio) * weight for weight in ob.base_weights
+            (1 + base_weights_offset_ratio) * weight for weight in ob.base_weights
         ]
-    if isinstance(ob.free_style_lower_bound, list) and isinstance(
-        ob.free_style_upper_bound, list
+    free_style_lower_bound = ob.free_style_lower_bound
+    free_style_upper_bound = ob.free_style_upper_bound
+    if isinstance(free_style_lower_bound, list) and isinstance(
+        free_style_upper_bound, list
     ):
-        for i in range(ob.weights_num):
-            free_style_weights.append(
-                trial.suggest_float(
-                    f"w{i+1}",
-                    ob.free_style_lower_bound[i],
-                    ob.free_style_upper_bound[i],
-                )
+        for i in range(weights_num):
+            free_style_weights[i] = suggest_float(
+                weight_names[i],
+                free_style_lower_bound[i],
+                free_style_upper_bound[i],
             )
         return free_style_weights
-    elif isinstance(ob.free_style_lower_bound, float) and isinstance(
-        ob.free_style_upper_bound, float
+    elif isinstance(free_style_lower_bound, float) and isinstance(
+        free_style_upper_bound, float
     ):
-        for i in range(ob.weights_num):
-            free_style_weights.append(
-                trial.suggest_float(
-                    f"w{i+1}", ob.free_style_lower_bound, ob.free_style_upper_bound
-                )
+        for i in range(weights_num):
+            free_style_weights[i] = suggest_float(
+                weight_names[i], free_style_lower_bound, free_style_upper_bound
             )
     else:
         raise ValueError("Invalid free style bounds.")
@@ -163,52 +258,111 @@ def construct_free_style_weights(
 
 def construct_log_pca_weights(
     ob: "MultipleObjective", trial: optuna.Trial
-) -> List[float]:
+) -> np.ndarray:
     """
-    Constructs a list of weights for log PCA components based on the optimization trial.
+    Constructs an array of weights for log PCA components based on the optimization trial.
 
-    This function generates a list of floating-point numbers representing the weights
+    This function generates an array of floating-point numbers representing the weights
     for log PCA components. Each weight is suggested by the trial within the bounds
     defined in the MultipleObjective instance.
 
     """
-    log_pca_weights: List[float] = []
     if ob.weights_num is None:
         ob.weights_num = ob.get_weights_num()
+    log_pca_weights = np.empty(ob.weights_num)
+    pca_importance_lower_bound = ob.pca_importance_lower_bound
+    pca_importance_upper_bound = ob.pca_importance_upper_bound
+    weight_names = ob.weight_names
+    suggest_float = trial.suggest_float
     for i in range(ob.weights_num):
-        log_pca_weights.append(
-            trial.suggest_float(
-                f"w{i+1}", ob.pca_importance_lower_bound, ob.pca_importance_upper_bound
-            )
+        log_pca_weights[i] = suggest_float(
+            weight_names[i], pca_importance_lower_bound, pca_importance_upper_bound
         )
     return log_pca_weights
 
 
-def construct_weights(ob: "MultipleObjective", trial: optuna.Trial) -> List[float]:
+def construct_first_order_power_weights(
+    ob: "MultipleObjective", trial: optuna.Trial
+) -> np.ndarray:
     """
-    Construct weights by combining power and first order weights as required by the MultipleObjective instance.
+    Construct power weights followed by first order weights in a single array.
 
     Args:
         ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the weights.
         trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
 
     Returns:
-        List[float]: A list of weights constructed based on the given MultipleObjective instance and the current trial.
+        np.ndarray: The power weights followed by the first order weights.
     """
-    weights = []
-    if ob.calculator.equation_type == "sum":
-        weights = construct_first_order_weights(ob, trial)
-    elif (ob.calculator.equation_type == "free_style") or (
-        ob.calculator.equation_type == "json"
-    ):
-        weights = construct_free_style_weights(ob, trial)
-    elif ob.calculator.equation_type == "log_pca":
-        weights = construct_log_pca_weights(ob, trial)
-    elif ob.calculator.equation_type == "product" and ob.first_order:
-        weights = construct_power_weights(ob, trial) + construct_first_order_weights(
-            ob, trial
-        )
-    elif not (ob.first_order):
-        weights = construct_power_weights(ob, trial)
-
+    weights_num = len(ob.first_order_weight_names)
+    power_num = 2 * weights_num if ob.dirichlet else weights_num
+    weights = np.empty(power_num + weights_num)
+    construct_power_weights(ob, trial, weights[:power_num])
+    ob.first_order_constructor(ob, trial, weights[power_num:])
     return weights
+
+
+def construct_sum_weights(ob: "MultipleObjective", trial: optuna.Trial) -> np.ndarray:
+    """
+    Construct the first order weights of a sum equation.
+
+    Args:
+        ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the weights.
+        trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
+
+    Returns:
+        np.ndarray: The first order weights.
+    """
+    return ob.first_order_constructor(ob, trial, None)
+
+
+def construct_no_weights(ob: "MultipleObjective", trial: optuna.Trial) -> np.ndarray:
+    """Construct no weights, for first order objectives whose equation type has none."""
+    return np.empty(0)
+
+
+WeightsConstructor = Callable[["MultipleObjective", optuna.Trial], np.ndarray]
+
+EQUATION_WEIGHTS_CONSTRUCTORS: Dict[str, WeightsConstructor] = {
+    "sum": construct_sum_weights,
+    "free_style": construct_free_style_weights,
+    "json": construct_free_style_weights,
+    "log_pca": construct_log_pca_weights,
+}
+
+
+def select_weights_constructor(ob: "MultipleObjective") -> WeightsConstructor:
+    """
+    Select the weights constructor matching the equation type and options of the MultipleObjective instance.
+
+    Args:
+        ob (MultipleObjective): An instance of the MultipleObjective class.
+
+    Returns:
+        WeightsConstructor: The constructor of the sum, free-style or log-PCA weights for those equation types,
+        otherwise `construct_power_weights` unless `first_order` is set, in which case
+        `construct_first_order_power_weights` for product equations and `construct_no_weights` for any other.
+    """
+    equation_type = ob.calculator.equation_type
+    constructor = EQUATION_WEIGHTS_CONSTRUCTORS.get(equation_type)
+    if constructor is not None:
+        return constructor
+    if not ob.first_order:
+        return construct_power_weights
+    if equation_type == "product":
+        return construct_first_order_power_weights
+    return construct_no_weights
+
+
+def construct_weights(ob: "MultipleObjective", trial: optuna.Trial) -> np.ndarray:
+    """
+    Construct weights by combining power and first order weights as required by the MultipleObjective instance.
+
+    Args:
+        ob (MultipleObjective): An instance of the MultipleObjective class, guiding the construction of the weights.
+        trial (optuna.Trial): The current optuna trial from which to suggest values for the weights.
+
+    Returns:
+        np.ndarray: The weights constructed based on the given MultipleObjective instance and the current trial.
+    """
+    return select_weights_constructor(ob)(ob, trial)
@@ -1,139 +1,466 @@
-from typing import List, Optional, Union
+import math
+from collections import defaultdict
+from enum import IntEnum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
 
 from ..evaluation import Calculator, LogarithmPCACalculator
 
 
-def evaluate_targets(
+class EvaluatorFlag(IntEnum):
+    """Integer identifiers of the evaluator flags accepted by `add_evaluator`."""
+
+    PEARSON = 0
+    PORTFOLIO = 1
+    CUMULATIVE_DEVIATION = 2
+    DISTINCT_COUNT_PORTFOLIO = 3
+    TOP_COVERAGE = 4
+    DISTINCT_TOP_COVERAGE = 5
+    WUAUC = 6
+    AUC = 7
+    WOAUC = 8
+    LOGMSE = 9
+    NEG_RANK_RATIO = 10
+    INVERSE_PAIRS = 11
+    TAU = 12
+
+    @classmethod
+    def from_flag(cls, flag: str) -> "EvaluatorFlag":
+        """
+        Converts an evaluator flag string into its integer identifier.
+
+        Args:
+            flag (str): The evaluator flag, e.g. "wuauc" or "portfolio".
+
+        Returns:
+            EvaluatorFlag: The identifier of the flag.
+
+        Raises:
+            ValueError: If the flag is not supported.
+        """
+        try:
+            return cls[flag.upper()]
+        except (AttributeError, KeyError):
+            raise ValueError(f"Unsupported evaluator flag: {flag}") from None
+
+
+class EvaluatorSpec(NamedTuple):
+    """
+    Options of one evaluator registered through `add_evaluator`.
+
+    Attributes:
+        flag (EvaluatorFlag): The evaluator to run.
+        target_column (str): The target column of the evaluator.
+        mask_column (Optional[str]): The mask column of the evaluator.
+        hyperparameter (Optional[float]): The hyperparameter of the evaluator.
+        evaluator_property (Optional[str]): The property of the evaluator.
+        groupby (Optional[str]): The groupby column of the evaluator.
+        weights_for_groups (Optional[pd.Series]): The group weights of the evaluator.
+    """
+
+    flag: EvaluatorFlag
+    target_column: str
+    mask_column: Optional[str] = None
+    hyperparameter: Optional[float] = None
+    evaluator_property: Optional[str] = None
+    groupby: Optional[str] = None
+    weights_for_groups: Optional[pd.Series] = None
+
+
+HandlerOptions = Tuple[
+    str,
+    Optional[str],
+    Optional[float],
+    Optional[str],
+    Optional[str],
+    Optional[pd.Series],
+]
+
+Handler = Callable[
+    [
+        Union[Calculator, LogarithmPCACalculator],
+        str,
+        Optional[str],
+        Optional[float],
+        Optional[str],
+        Optional[str],
+        Optional[pd.Series],
+    ],
+    float,
+]
+
+
+def _evaluate_pearson(
     calculator: Union[Calculator, LogarithmPCACalculator],
-    evaluator_flags: List[str],
-    target_columns: List[str],
-    mask_columns: List[Optional[str]],
-    hyperparameters: List[Optional[float]],
-    evaluator_propertys: List[Optional[str]],
-    groupbys: List[Optional[str]],
-    group_weights: List[Optional[pd.Series]],
-) -> List[float]:
-    targets = []
-    for (
-        flag,
-        mask_column,
-        hyperparameter,
-        evaluator_property,
-        groupby,
-        target_column,
-        weights_for_groups,
-    ) in zip(
-        evaluator_flags,
-        mask_columns,
-        hyperparameters,
-        evaluator_propertys,
-        groupbys,
-        target_columns,
-        group_weights,
-    ):
-        if flag == "pearson":
-            corrcoef = calculator.calculate_corrcoef(
-                target_column=target_column,
-                mask_column=mask_column,
-            )
-            targets.append(corrcoef)
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_corrcoef(
+            target_column=target_column,
+            mask_column=mask_column,
+        )
+    )
 
-        elif flag == "portfolio":
-            _, concentration = calculator.calculate_portfolio_concentration(
-                target_column=target_column,
-                mask_column=mask_column,
-                expected_return=hyperparameter,
-            )
-            targets.append(concentration)
 
-        elif flag == "cumulative_deviation":
-            cumulative_deviation = calculator.calculate_cumulative_deviation(
-                target_column=target_column,
-                mask_column=mask_column,
-                n_quantiles=hyperparameter,
-            )
-            targets.append(cumulative_deviation)
+def _evaluate_portfolio(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    _, concentration = calculator.calculate_portfolio_concentration(
+        target_column=target_column,
+        mask_column=mask_column,
+        expected_return=hyperparameter,
+    )
+    return float(concentration)
 
-        elif flag == "distinct_count_portfolio":
-            (
-                _,
-                concentration,
-            ) = calculator.calculate_distinct_count_portfolio_concentration(
-                target_column=target_column,
-                mask_column=mask_column,
-                expected_coverage=hyperparameter,
-            )
-            targets.append(concentration)
 
-        elif flag == "top_coverage":
-            top_coverage = calculator.calculate_top_coverage(
-                target_column=target_column,
-                mask_column=mask_column,
-                head_percentage=hyperparameter,
-            )
-            targets.append(top_coverage)
+def _evaluate_cumulative_deviation(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_cumulative_deviation(
+            target_column=target_column,
+            mask_column=mask_column,
+            n_quantiles=hyperparameter,
+        )
+    )
 
-        elif flag == "distinct_top_coverage":
-            distinct_top_coverage = calculator.calculate_distinct_top_coverage(
-                target_column=target_column,
-                mask_column=mask_column,
-                head_percentage=hyperparameter,
-            )
-            targets.append(distinct_top_coverage)
-
-        elif flag == "wuauc":
-            wuauc = calculator.calculate_wuauc(
-                target_column=target_column,
-                mask_column=mask_column,
-                groupby=groupby,
-                weights_for_groups=weights_for_groups,
-            )
-            targets.append(wuauc)
-
-        elif flag == "auc":
-            auc = calculator.calculate_wuauc(
-                target_column=target_column,
-                mask_column=mask_column,
-                groupby=groupby,
-                weights_for_groups=weights_for_groups,
-                auc=True,
-            )
-            targets.append(auc)
 
-        elif flag == "woauc":
-            woauc = calculator.calculate_woauc(
-                target_column=target_column,
-                groupby=groupby,
-                weights_for_groups=weights_for_groups,
-            )
-            targets.append(sum(woauc))
+def _evaluate_distinct_count_portfolio(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    _, concentration = calculator.calculate_distinct_count_portfolio_concentration(
+        target_column=target_column,
+        mask_column=mask_column,
+        expected_coverage=hyperparameter,
+    )
+    return float(concentration)
 
-        elif flag == "logmse":
-            mse = calculator.calculate_log_mse(
-                target_column=target_column,
-            )
-            targets.append(mse)
-        elif flag == "neg_rank_ratio":
-            neg_rank_ratio = calculator.calculate_neg_rank_ratio(
-                label_column=target_column
-            )
-            targets.append(neg_rank_ratio)
 
-        elif flag == "inverse_pairs":
-            inverse_score = calculator.calculate_inverse_pair(
-                calculator=calculator,
-                weights_type=evaluator_property,
-            )
-            targets.append(inverse_score)
-
-        elif flag == "tau":
-            tau = calculator.calculate_tau(
-                groupby=groupby,
-                target_column=target_column,
-                weights_for_groups=weights_for_groups,
-                num_bins=hyperparameter,
+def _evaluate_top_coverage(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_top_coverage(
+            target_column=target_column,
+            mask_column=mask_column,
+            head_percentage=hyperparameter,
+        )
+    )
+
+
+def _evaluate_distinct_top_coverage(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_distinct_top_coverage(
+            target_column=target_column,
+            mask_column=mask_column,
+            head_percentage=hyperparameter,
+        )
+    )
+
+
+def _evaluate_woauc(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    woauc = calculator.calculate_woauc(
+        target_column=target_column,
+        groupby=groupby,
+        weights_for_groups=weights_for_groups,
+    )
+    return math.fsum(woauc)
+
+
+def _evaluate_logmse(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_log_mse(
+            target_column=target_column,
+        )
+    )
+
+
+def _evaluate_neg_rank_ratio(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(calculator.calculate_neg_rank_ratio(label_column=target_column))
+
+
+def _evaluate_inverse_pairs(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_inverse_pair(
+            calculator=calculator,
+            weights_type=evaluator_property,
+        )
+    )
+
+
+def _evaluate_tau(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    target_column: str,
+    mask_column: Optional[str],
+    hyperparameter: Optional[float],
+    evaluator_property: Optional[str],
+    groupby: Optional[str],
+    weights_for_groups: Optional[pd.Series],
+) -> float:
+    return float(
+        calculator.calculate_tau(
+            groupby=groupby,
+            target_column=target_column,
+            weights_for_groups=weights_for_groups,
+            num_bins=hyperparameter,
+        )
+    )
+
+
+HANDLERS: Dict[int, Handler] = {
+    EvaluatorFlag.PEARSON: _evaluate_pearson,
+    EvaluatorFlag.PORTFOLIO: _evaluate_portfolio,
+    EvaluatorFlag.CUMULATIVE_DEVIATION: _evaluate_cumulative_deviation,
+    EvaluatorFlag.DISTINCT_COUNT_PORTFOLIO: _evaluate_distinct_count_portfolio,
+    EvaluatorFlag.TOP_COVERAGE: _evaluate_top_coverage,
+    EvaluatorFlag.DISTINCT_TOP_COVERAGE: _evaluate_distinct_top_coverage,
+    EvaluatorFlag.WOAUC: _evaluate_woauc,
+    EvaluatorFlag.LOGMSE: _evaluate_logmse,
+    EvaluatorFlag.NEG_RANK_RATIO: _evaluate_neg_rank_ratio,
+    EvaluatorFlag.INVERSE_PAIRS: _evaluate_inverse_pairs,
+    EvaluatorFlag.TAU: _evaluate_tau,
+}
+
+
+class EvaluatorPlan(NamedTuple):
+    """
+    The evaluators of an objective, partitioned once into how they are evaluated.
+
+    Attributes:
+        size (int): The number of evaluators.
+        plain_evaluators (List[Tuple[int, Handler, HandlerOptions]]): The position, handler
+            and handler arguments after the calculator of each evaluator scored on its own.
+        auc_batches (List[Tuple[List[int], Dict[str, Any]]]): The positions and the
+            `calculate_wuauc_batch` arguments of each batch of AUC/WUAUC evaluators.
+    """
+
+    size: int
+    plain_evaluators: List[Tuple[int, Handler, HandlerOptions]]
+    auc_batches: List[Tuple[List[int], Dict[str, Any]]]
+
+
+def plan_evaluators(evaluators: Sequence[EvaluatorSpec]) -> EvaluatorPlan:
+    """
+    Partitions the evaluators into those scored by a handler and batches of AUC/WUAUC.
+
+    Args:
+        evaluators (Sequence[EvaluatorSpec]): The evaluators to plan.
+
+    Returns:
+        EvaluatorPlan: The plan consumed by `evaluate_planned_targets`.
+    """
+    plain_evaluators: List[Tuple[int, Handler, HandlerOptions]] = []
+    batched_auc_indices: Dict[bool, List[int]] = defaultdict(list)
+    for index, evaluator in enumerate(evaluators):
+        flag = evaluator.flag
+        if flag == EvaluatorFlag.WUAUC:
+            batched_auc_indices[False].append(index)
+        elif flag == EvaluatorFlag.AUC:
+            batched_auc_indices[True].append(index)
+        else:
+            plain_evaluators.append(
+                (
+                    index,
+                    HANDLERS[flag],
+                    (
+                        evaluator.target_column,
+                        evaluator.mask_column,
+                        evaluator.hyperparameter,
+                        evaluator.evaluator_property,
+                        evaluator.groupby,
+                        evaluator.weights_for_groups,
+                    ),
+                )
             )
-            targets.append(tau)
+
+    auc_batches: List[Tuple[List[int], Dict[str, Any]]] = []
+    for auc, indices in batched_auc_indices.items():
+        batch = [evaluators[i] for i in indices]
+        batch_kwargs = {
+            "target_columns": [evaluator.target_column for evaluator in batch],
+            "mask_columns": [evaluator.mask_column for evaluator in batch],
+            "groupbys": [evaluator.groupby for evaluator in batch],
+            "weights_for_groups": [evaluator.weights_for_groups for evaluator in batch],
+            "auc": auc,
+        }
+        auc_batches.append((indices, batch_kwargs))
+    return EvaluatorPlan(len(evaluators), plain_evaluators, auc_batches)
+
+
+def evaluate_planned_targets(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    plan: EvaluatorPlan,
+) -> np.ndarray:
+    """
+    Evaluates every planned evaluator on the current overall score of the calculator.
+
+    Args:
+        calculator (Union[Calculator, LogarithmPCACalculator]): The calculator holding the overall score.
+        plan (EvaluatorPlan): The evaluators to run, as returned by `plan_evaluators`.
+
+    Returns:
+        np.ndarray: The float64 value of each evaluator, in the order they were planned.
+    """
+    targets = np.empty(plan.size, dtype=np.float64)
+    for index, handler, options in plan.plain_evaluators:
+        targets[index] = handler(calculator, *options)
+
+    for indices, batch_kwargs in plan.auc_batches:
+        targets[indices] = calculator.calculate_wuauc_batch(**batch_kwargs)
+    return targets
+
+
+def evaluate_targets(
+    calculator: Union[Calculator, LogarithmPCACalculator],
+    evaluator_flags: Sequence[Union[str, EvaluatorFlag]],
+    target_columns: Sequence[str],
+    mask_columns: Optional[Sequence[Optional[str]]] = None,
+    hyperparameters: Optional[Sequence[Optional[float]]] = None,
+    evaluator_propertys: Optional[Sequence[Optional[str]]] = None,
+    groupbys: Optional[Sequence[Optional[str]]] = None,
+    group_weights: Optional[Sequence[Optional[pd.Series]]] = None,
+) -> List[float]:
+    """
+    Evaluates every evaluator given as parallel lists on the current overall score of the calculator.
+
+    The evaluators are planned on each call; objectives that evaluate the same evaluators
+    repeatedly plan them once with `plan_evaluators` and call `evaluate_planned_targets`.
+
+    Args:
+        calculator (Union[Calculator, LogarithmPCACalculator]): The calculator holding the overall score.
+        evaluator_flags (Sequence[Union[str, EvaluatorFlag]]): The evaluator of each target, e.g. "wuauc".
+        target_columns (Sequence[str]): The target column of each evaluator.
+        mask_columns (Optional[Sequence[Optional[str]]], optional): The mask column of each evaluator. Defaults to None,
+            which applies no mask.
+        hyperparameters (Optional[Sequence[Optional[float]]], optional): The hyperparameter of each evaluator.
+            Defaults to None.
+        evaluator_propertys (Optional[Sequence[Optional[str]]], optional): The property of each evaluator.
+            Defaults to None.
+        groupbys (Optional[Sequence[Optional[str]]], optional): The groupby column of each evaluator. Defaults to None.
+        group_weights (Optional[Sequence[Optional[pd.Series]]], optional): The group weights of each evaluator.
+            Defaults to None.
+
+    Returns:
+        List[float]: The value of each evaluator, in the order of `evaluator_flags`.
+
+    Raises:
+        ValueError: If a flag is not supported.
+    """
+    n = len(evaluator_flags)
+    evaluators = [
+        EvaluatorSpec(
+            (
+                flag
+                if isinstance(flag, EvaluatorFlag)
+                else EvaluatorFlag.from_flag(flag)
+            ),
+            target_column,
+            mask_column,
+            hyperparameter,
+            evaluator_property,
+            groupby,
+            weights_for_groups,
+        )
+        for (
+            flag,
+            target_column,
+            mask_column,
+            hyperparameter,
+            evaluator_property,
+            groupby,
+            weights_for_groups,
+        ) in zip(
+            evaluator_flags,
+            target_columns,
+            mask_columns or [None] * n,
+            hyperparameters or [None] * n,
+            evaluator_propertys or [None] * n,
+            groupbys or [None] * n,
+            group_weights or [None] * n,
+        )
+    ]
+    targets: List[float] = evaluate_planned_targets(
+        calculator, plan_evaluators(evaluators)
+    ).tolist()
     return targets
@@ -1,29 +1,20 @@
 import os
-import platform
-import subprocess
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def get_logical_processors_count() -> int:
     """
-    Fetch the count of logical processors based on the system type.
+    Fetch the count of logical processors available to the current process.
+
+    On Linux the CPU affinity mask is used, so CPU sets restricted by taskset or
+    containers are respected; other systems fall back to `os.cpu_count()`. The
+    result is cached, since it does not change within a process.
 
     Returns:
         int: Number of logical processors.
-
-    Raises:
-        ValueError: If the system is not Windows, Darwin (MacOS), or Linux.
     """
-
-    system: str = platform.system()
-
-    if system == "Windows":
-        return int(os.environ["NUMBER_OF_PROCESSORS"])
-    elif system == "Darwin":
-        return int(
-            subprocess.check_output(["sysctl", "-n", "hw.ncpu"]).decode("utf-8").strip()
-        )
-    elif system == "Linux":
-        command: str = "grep -c ^processor /proc/cpuinfo"
-        return int(subprocess.check_output(command, shell=True).decode("utf-8").strip())
-    else:
-        raise ValueError(f"Unsupported OS: {system}")
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
@@ -1,5 +1,8 @@
-from functools import partialmethod
-from typing import Dict, List, Optional, Union
+import logging
+import re
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -7,8 +10,23 @@ from optuna.trial import Trial
 
 from ..evaluation import Calculator, LogarithmPCACalculator
 from .base import BaseObjective, BaseObjectiveConfig
-from .construct_weights import construct_weights
-from .evaluate_targets import evaluate_targets
+from .compile_formula import FormulaFunction, compile_formula
+from .construct_weights import (
+    DIRICHLET_WEIGHTS_ATTR,
+    construct_first_order_power_weights,
+    construct_power_weights,
+    construct_weights,
+    select_first_order_constructor,
+    select_weights_constructor,
+)
+from .evaluate_targets import (
+    EvaluatorFlag,
+    EvaluatorSpec,
+    evaluate_planned_targets,
+    plan_evaluators,
+)
+
+_WEIGHT_PLACEHOLDER = re.compile(r"weights\[(\d+)\]")
 
 
 class MultipleObjectiveConfig(BaseObjectiveConfig):
@@ -29,6 +47,7 @@ class MultipleObjectiveConfig(BaseObjectiveConfig):
         power_upper_bound (Union[float, List[float]]): The upper bound for the power objective.
         pca_importance_lower_bound (float): The lower bound for PCA importance.
         pca_importance_upper_bound (float): The upper bound for PCA importance.
+        targets_cache_size (int): The number of distinct weight vectors whose targets are cached. 0 disables the cache.
     """
 
     first_order_with_scales: bool = True
@@ -45,6 +64,7 @@ class MultipleObjectiveConfig(BaseObjectiveConfig):
     power_upper_bound: Union[float, List[float]] = 1
     pca_importance_lower_bound: float = 0
     pca_importance_upper_bound: float = 10
+    targets_cache_size: int = 1024
 
 
 class MultipleObjective(BaseObjective):
@@ -52,7 +72,38 @@ class MultipleObjective(BaseObjective):
     This class provides methods to optimize the portfolio objective.
     """
 
-    construct_weights = partialmethod(construct_weights)
+    __slots__ = (
+        "first_order_lower_bound",
+        "first_order_upper_bound",
+        "first_order_log_scale",
+        "first_order_with_scales",
+        "free_style_lower_bound",
+        "free_style_upper_bound",
+        "base_weights",
+        "base_weights_offset_ratio",
+        "max_min_scale_ratio",
+        "first_order_scale_upper_bound",
+        "first_order_scale_lower_bound",
+        "power_lower_bound",
+        "power_upper_bound",
+        "pca_importance_lower_bound",
+        "pca_importance_upper_bound",
+        "evaluators",
+        "compiled_formulas",
+        "targets_cache",
+        "targets_cache_size",
+        "calculator_version",
+        "evaluate_targets_kwargs",
+        "weight_names",
+        "dirichlet_fraction_names",
+        "first_order_weight_names",
+        "first_order_constructor",
+        "weights_constructor",
+        "warmup_best_value",
+        "completed_formulas",
+    )
+
+    construct_weights = construct_weights
 
     def __init__(
         self,
@@ -69,6 +120,8 @@ class MultipleObjective(BaseObjective):
         study_path: Optional[str] = None,
         save_study: Optional[bool] = True,
         entry_point_path: Optional[str] = None,
+        n_jobs: int = 1,
+        storage: Optional[str] = None,
         first_order_with_scales: bool = True,
         first_order_lower_bound: float = 1e-3,
         first_order_upper_bound: float = 1e6,
@@ -83,6 +136,7 @@ class MultipleObjective(BaseObjective):
         power_upper_bound: Union[float, List[float]] = 1,
         pca_importance_lower_bound: float = 0,
         pca_importance_upper_bound: float = 10,
+        targets_cache_size: int = 1024,
         config: Optional[Dict] = None,
     ) -> None:
         """
@@ -96,6 +150,7 @@ class MultipleObjective(BaseObjective):
             power_upper_bound (Union[float, List[float]]): Upper bound for power value. Defaults to 1.
             pca_importance_lower_bound (float, optional): Lower bound for pca importance value. Defaults to 0.
             pca_importance_upper_bound (float, optional): Upper bound for pca importance value. Defaults to 10.
+            targets_cache_size (int, optional): Number of distinct weight vectors whose targets are cached. 0 disables the cache. Defaults to 1024.
             first_order_scale_bound (Optional[float], optional): Scale bound for first order value. Defaults to None.
         """
 
@@ -115,6 +170,8 @@ class MultipleObjective(BaseObjective):
                 study_path=study_path,
                 save_study=save_study,
                 entry_point_path=entry_point_path,
+                n_jobs=n_jobs,
+                storage=storage,
                 first_order_with_scales=first_order_with_scales,
                 first_order_lower_bound=first_order_lower_bound,
                 first_order_upper_bound=first_order_upper_bound,
@@ -129,6 +186,7 @@ class MultipleObjective(BaseObjective):
                 power_upper_bound=power_upper_bound,
                 pca_importance_lower_bound=pca_importance_lower_bound,
                 pca_importance_upper_bound=pca_importance_upper_bound,
+                targets_cache_size=targets_cache_size,
             )
         self.calculator = calculator
         self.direction = self.config.direction
@@ -143,8 +201,12 @@ class MultipleObjective(BaseObjective):
         self.study_path = self.config.study_path
         self.save_study = self.config.save_study
         self.entry_point_path = self.config.entry_point_path
+        self.n_jobs = self.config.n_jobs
+        self.storage = self.config.storage
+        self.info_logger: Optional[logging.Logger] = None
         self.first_order_lower_bound = self.config.first_order_lower_bound
         self.first_order_upper_bound = self.config.first_order_upper_bound
+        self.first_order_log_scale = self.first_order_lower_bound >= 0
         self.first_order_with_scales = self.config.first_order_with_scales
         self.free_style_lower_bound = self.config.free_style_lower_bound
         self.free_style_upper_bound = self.config.free_style_upper_bound
@@ -157,20 +219,54 @@ class MultipleObjective(BaseObjective):
         self.power_upper_bound = self.config.power_upper_bound
         self.pca_importance_lower_bound = self.config.pca_importance_lower_bound
         self.pca_importance_upper_bound = self.config.pca_importance_upper_bound
-        self.target_columns: List[str] = []
-        self.mask_columns: List[Optional[str]] = []
-        self.evaluator_flags: List[str] = []
-        self.groupbys: List[Optional[str]] = []
-        self.group_weights: List[Optional[pd.Series]] = []
-        self.hyperparameters: List[Optional[float]] = []
-        self.evaluator_propertys: List[Optional[str]] = []
+        self.evaluators: List[EvaluatorSpec] = []
+        self.compiled_formulas: Dict[str, FormulaFunction] = {}
+        self.targets_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.targets_cache_size = self.config.targets_cache_size
+        self.calculator_version = 0
+        self.evaluate_targets_kwargs: Dict[str, Any] = {}
+        self._prepare_evaluate_targets_kwargs()
+        self._prepare_study()
+        self._prepare_calculator()
+
+    def _prepare_calculator(self) -> None:
+        """
+        Prepares the weight construction for the current calculator.
 
+        Side effects:
+            - Computes the value scales of a Calculator whose equation is not free-style or json.
+            - Recounts `self.weights_num` from the calculator unless it was configured.
+            - Precomputes the weight names and selects the weight constructors.
+        """
         if self.calculator.equation_type not in ["free_style", "json"] and isinstance(
             self.calculator, Calculator
         ):
             self.calculator.value_scale()
+        if self.config.weights_num is None:
+            self.weights_num = None
+        self._prepare_weight_names()
+        self.first_order_constructor = select_first_order_constructor(self)
+        self.weights_constructor = select_weights_constructor(self)
 
-        self._prepare_study()
+    def _prepare_weight_names(self) -> None:
+        """
+        Precomputes the Optuna parameter names used by the weight constructors.
+
+        Side effects:
+            - Initializes `self.weight_names` with ``w1, w2, ...``.
+            - Initializes `self.dirichlet_fraction_names` with ``w_po_frac_1, w_po_frac_2, ...``.
+            - Initializes `self.first_order_weight_names` with ``w_fo_1, w_fo_2, ...``.
+        """
+        if self.weights_num is None:
+            self.weights_num = self.get_weights_num()
+        indices = range(1, self.weights_num + 1)
+        self.weight_names: Tuple[str, ...] = tuple(sys.intern(f"w{i}") for i in indices)
+        self.dirichlet_fraction_names: Tuple[str, ...] = tuple(
+            sys.intern(f"w_po_frac_{i}") for i in indices
+        )
+        self.first_order_weight_names: Tuple[str, ...] = tuple(
+            sys.intern(f"w_fo_{i}") for i in indices
+        )
 
     def add_evaluator(
         self,
@@ -192,52 +288,192 @@ class MultipleObjective(BaseObjective):
             evaluator_property (Optional[str], optional): Property of the evaluator. Defaults to None.
             groupby (Optional[str], optional): Grouping criteria. Defaults to None.
         """
-        self.evaluator_flags.append(flag)
-        self.target_columns.append(target_column)
-        if mask_column is not None:
-            self.mask_columns.append(mask_column)
-        else:
-            self.mask_columns.append(None)
-        if hyperparameter is not None:
-            self.hyperparameters.append(hyperparameter)
-        else:
-            self.hyperparameters.append(None)
-        if groupby is not None:
-            self.groupbys.append(groupby)
-        else:
-            self.groupbys.append(None)
-        if evaluator_property is not None:
-            self.evaluator_propertys.append(evaluator_property)
-        else:
-            self.evaluator_propertys.append(None)
-        if weights_for_groups is not None:
-            self.group_weights.append(weights_for_groups)
-        else:
-            self.group_weights.append(None)
+        self.evaluators.append(
+            EvaluatorSpec(
+                EvaluatorFlag.from_flag(flag),
+                target_column,
+                mask_column,
+                hyperparameter,
+                evaluator_property,
+                groupby,
+                weights_for_groups,
+            )
+        )
+        self._prepare_evaluate_targets_kwargs()
+        self.targets_cache.clear()
+
+    @property
+    def evaluator_flags(self) -> List[str]:
+        """The flag of each evaluator, e.g. "wuauc"."""
+        return [evaluator.flag.name.lower() for evaluator in self.evaluators]
+
+    @property
+    def target_columns(self) -> List[str]:
+        """The target column of each evaluator."""
+        return [evaluator.target_column for evaluator in self.evaluators]
+
+    @property
+    def mask_columns(self) -> List[Optional[str]]:
+        """The mask column of each evaluator."""
+        return [evaluator.mask_column for evaluator in self.evaluators]
+
+    @property
+    def hyperparameters(self) -> List[Optional[float]]:
+        """The hyperparameter of each evaluator."""
+        return [evaluator.hyperparameter for evaluator in self.evaluators]
+
+    @property
+    def evaluator_propertys(self) -> List[Optional[str]]:
+        """The property of each evaluator."""
+        return [evaluator.evaluator_property for evaluator in self.evaluators]
 
-    def evaluate_custom_weights(self, weights: List[float]) -> List[float]:
+    @property
+    def groupbys(self) -> List[Optional[str]]:
+        """The groupby column of each evaluator."""
+        return [evaluator.groupby for evaluator in self.evaluators]
+
+    @property
+    def group_weights(self) -> List[Optional[pd.Series]]:
+        """The group weights of each evaluator."""
+        return [evaluator.weights_for_groups for evaluator in self.evaluators]
+
+    def _prepare_evaluate_targets_kwargs(self) -> None:
+        """
+        Binds the calculator and evaluator plan passed to `evaluate_planned_targets` on every trial.
+
+        Side effects:
+            - Initializes `self.evaluate_targets_kwargs` with the calculator and the plan
+              of the current evaluators.
+            - Records the `score_inputs_version` of the calculator in `self.calculator_version`.
+        """
+        self.evaluate_targets_kwargs = {
+            "calculator": self.calculator,
+            "plan": plan_evaluators(self.evaluators),
+        }
+        self.calculator_version = self.calculator.score_inputs_version
+
+    def _sync_with_calculator(self) -> None:
+        """
+        Prepares the weight construction again, rebinds the evaluator plan and empties
+        `targets_cache` if the calculator was replaced or one of its score inputs was
+        assigned since the plan was bound.
+        """
+        calculator = self.calculator
+        if (
+            self.evaluate_targets_kwargs["calculator"] is not calculator
+            or self.calculator_version != calculator.score_inputs_version
+        ):
+            self._prepare_calculator()
+            self._prepare_evaluate_targets_kwargs()
+            self.targets_cache.clear()
+
+    def evaluate_custom_weights(
+        self, weights: Union[List[float], np.ndarray]
+    ) -> np.ndarray:
         """
         Evaluate the objective function with custom weights.
 
         Args:
-            weights (List[float]): Custom weights to evaluate.
+            weights (Union[List[float], np.ndarray]): Custom weights to evaluate.
+        """
+        calculator = self.calculator
+        with calculator.score_lock:
+            self._sync_with_calculator()
+            calculator.update_overall_score(
+                weights_for_equation=weights,
+            )
+            targets = evaluate_planned_targets(**self.evaluate_targets_kwargs)
+
+        return targets
+
+    def _construct_and_evaluate(self, trial: Trial) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Suggests the weights of the trial and evaluates them, reusing the targets of
+        weights seen in recent trials.
+
+        The targets of the last `targets_cache_size` distinct weight vectors are kept in
+        least-recently-used order, so repeated or enqueued parameter sets skip `evaluate_planned_targets`.
+        The cache is cleared when an evaluator is added, and disabled when `targets_cache_size`
+        is 0. When the calculator is replaced or one of its `score_inputs` is assigned, the
+        cache is cleared and the weight constructors are selected again.
+        Changes made inside the DataFrame of the calculator are not tracked; clear the cache
+        after them.
+
+        Args:
+            trial (Trial): Optuna trial instance.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The weights and the targets of the trial.
         """
-        self.calculator.get_overall_score(
-            weights_for_equation=weights,
+        calculator = self.calculator
+        with calculator.score_lock:
+            self._sync_with_calculator()
+        weights = self.weights_constructor(self, trial)
+        key = weights.tobytes()
+        with calculator.score_lock:
+            self._sync_with_calculator()
+            targets = self.targets_cache.get(key)
+            if targets is not None:
+                self.targets_cache.move_to_end(key)
+                return weights, targets
+            calculator.update_overall_score(
+                weights_for_equation=weights,
+            )
+            targets = evaluate_planned_targets(**self.evaluate_targets_kwargs)
+            if self.targets_cache_size > 0:
+                self.targets_cache[key] = targets
+                if len(self.targets_cache) > self.targets_cache_size:
+                    self.targets_cache.popitem(last=False)
+        return weights, targets
+
+    @property
+    def uses_dirichlet_weights(self) -> bool:
+        """Whether the constructed weights start with `weights_num` Dirichlet weights."""
+        return bool(self.dirichlet) and self.weights_constructor in (
+            construct_power_weights,
+            construct_first_order_power_weights,
         )
 
-        targets = evaluate_targets(
-            calculator=self.calculator,
-            evaluator_flags=self.evaluator_flags,
-            mask_columns=self.mask_columns,
-            hyperparameters=self.hyperparameters,
-            evaluator_propertys=self.evaluator_propertys,
-            groupbys=self.groupbys,
-            target_columns=self.target_columns,
-            group_weights=self.group_weights,
+    def get_best_params(self) -> np.ndarray:
+        """
+        Collects the weights of the best trial of the study, in the order they are constructed.
+
+        When the weights start with Dirichlet weights, the stick-breaking fractions suggested
+        by the trial are replaced by the Dirichlet weights recorded in its user attributes.
+
+        Returns:
+            np.ndarray: The float64 weights of the best trial.
+        """
+        best_trial = self.study.best_trial
+        params = best_trial.params
+        dirichlet_weights = best_trial.user_attrs.get(DIRICHLET_WEIGHTS_ATTR)
+        if dirichlet_weights is None:
+            return np.fromiter(params.values(), dtype=np.float64, count=len(params))
+        fraction_names = set(self.dirichlet_fraction_names)
+        return np.array(
+            dirichlet_weights
+            + [value for name, value in params.items() if name not in fraction_names],
+            dtype=np.float64,
         )
 
-        return targets
+    def _compile_formula(self, formula: str) -> FormulaFunction:
+        """
+        Compiles a formula into a function of the targets, reusing it for later trials.
+
+        Formulas are cached by their source, so a changed `formula` or `warmup_formula`
+        is compiled again on its first use.
+
+        Args:
+            formula (str): The formula to compile.
+
+        Returns:
+            FormulaFunction: The compiled formula.
+        """
+        function = self.compiled_formulas.get(formula)
+        if function is None:
+            function = compile_formula(formula)
+            self.compiled_formulas[formula] = function
+        return function
 
     def objective(
         self,
@@ -252,9 +488,7 @@ class MultipleObjective(BaseObjective):
         Returns:
             float: Computed objective value based on the provided trial.
         """
-        weights = construct_weights(self, trial)
-        targets = self.evaluate_custom_weights(weights)
-        local_vars = {"targets": targets, "sum": sum, "max": max, "min": min}
+        weights, targets = self._construct_and_evaluate(trial)
 
         if self.warmup_formula is not None and trial.number < self.warmup_trials:
             formula = str(self.warmup_formula)
@@ -267,7 +501,7 @@ class MultipleObjective(BaseObjective):
         else:
             formula = str(self.formula)
 
-        result = float(eval(formula, {"__builtins__": None}, local_vars))
+        result = float(self._compile_formula(formula)(targets))
 
         if self.warmup_formula and trial.number > self.warmup_trials:
             if not hasattr(self, "warmup_best_value"):
@@ -280,10 +514,11 @@ class MultipleObjective(BaseObjective):
             elif self.direction == "minimize":
                 result -= self.warmup_best_value
 
-        if self.logger:
-            self.logger.info(f"Trial {trial.number} finished with result: {result}")
-            self.logger.info(f"targets: {targets}")
-            self.logger.info(f"weights: {weights}")
+        info_logger = self.info_logger
+        if info_logger is not None:
+            info_logger.info("Trial %d finished with result: %s", trial.number, result)
+            info_logger.info("targets: %s", targets.tolist())
+            info_logger.info("weights: %s", weights.tolist())
         return result
 
     def export_completed_formulas(self, weights: Optional[np.ndarray] = None) -> None:
@@ -292,7 +527,8 @@ class MultipleObjective(BaseObjective):
 
         If `weights` is not provided, it defaults to `self.best_params`. The method updates
         `self.completed_formulas` by replacing occurrences of `weights[i]` in the stored
-        equations with corresponding values from the weight array.
+        equations with corresponding values from the weight array. The equations of the
+        calculator are left unchanged.
 
         Args:
             weights (Optional[np.ndarray]): An optional numpy array containing weight values
@@ -308,9 +544,16 @@ class MultipleObjective(BaseObjective):
         if isinstance(self.calculator, Calculator) and hasattr(
             self.calculator, "equation_json"
         ):
-            json_equations = self.calculator.equation_json.formula
-            for key, expr in json_equations.items():
-                for i, param in enumerate(weights):
-                    expr = expr.replace(f"weights[{i}]", str(param))
-                json_equations[key] = expr
+            weight_strs = [str(param) for param in weights]
+
+            def substitute(match: "re.Match[str]") -> str:
+                index = int(match.group(1))
+                if index < len(weight_strs):
+                    return weight_strs[index]
+                return match.group(0)
+
+            json_equations = {
+                key: _WEIGHT_PLACEHOLDER.sub(substitute, expr)
+                for key, expr in self.calculator.equation_json.formula.items()
+            }
         self.completed_formulas = json_equations
@@ -1,9 +1,9 @@
 import csv
-import subprocess
+import re
+import shutil
 import sys
 import threading
-import time
-from typing import Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from joblib import Parallel, delayed
@@ -12,6 +12,28 @@ from .get_processors import get_logical_processors_count
 from .multiple_objective import MultipleObjective
 from .save_study import save_study
 
+_RESULT_LINE = re.compile(r"Trial (\d+) finished with result: (\S+)")
+_VALUES_LINE = re.compile(r"(targets|weights): \[(.*)\]")
+_BEST_LINE = re.compile(r"Best is trial (\d+)")
+
+
+def _parse_values(values: str) -> np.ndarray:
+    """
+    Parses the comma-separated values logged inside a list, e.g. "0.1, 0.5".
+
+    Args:
+        values (str): The logged values without the brackets.
+
+    Returns:
+        np.ndarray: The values as float64.
+
+    Raises:
+        ValueError: If a value is not a number.
+    """
+    if not values.strip():
+        return np.empty(0)
+    return np.array(values.split(","), dtype=np.float64)
+
 
 def parallel_optimize(
     multiple_objective: MultipleObjective, i: int, ntrials: int
@@ -31,96 +53,132 @@ def parallel_optimize(
 
 
 def get_best_trials(
-    multiple_objective: MultipleObjective, refresh_rate: int = 5
+    multiple_objective: MultipleObjective,
+    refresh_rate: int = 5,
+    stop_event: Optional[threading.Event] = None,
 ) -> None:
     """
     Extracts and saves the best trials from the provided log content.
+
+    The log is read incrementally: each poll reads only what was appended since the
+    previous one, and a single forward pass over the new lines collects the logged
+    lines of each trial, so a best trial is looked up instead of searched for. Only the
+    best trials found by a poll are appended to the CSV.
+
+    Args:
+        multiple_objective (MultipleObjective): The objective whose log is followed.
+        refresh_rate (int, optional): Seconds between two polls. Defaults to 5.
+        stop_event (Optional[threading.Event], optional): Once set, the log is polled a
+            last time and the function returns. Defaults to None, which polls forever.
     """
+    if stop_event is None:
+        stop_event = threading.Event()
     ob = multiple_objective
     file_path = f"{ob.full_path}/paradance.log"
     output_path = f"{ob.full_path}/paradance_best_trials.csv"
 
+    partial_line = b""
+    position = 0
+    # The result, targets and weights logged for each trial, in a single pass.
+    trial_fields: Dict[int, List[str]] = {}
+    awaiting_targets: List[int] = []
+    awaiting_weights: List[int] = []
+    best_trials: Set[int] = set()
+    csv_started = False
+
     while True:
+        stopping = stop_event.is_set()
         try:
-            best_trials = set()
-            with open(file_path, "r") as file:
-                lines = file.readlines()
-
-            extracted_data = []
-            for idx, line in enumerate(lines):
-                if "Best is trial" in line:
-                    trial_number = int(line.split("Best is trial")[1].split(" ")[1])
-                    if trial_number in best_trials:
-                        continue
-
-                    best_trials.add(trial_number)
-
-                    for sub_idx in range(idx, -1, -1):
-                        if (
-                            f"Trial {trial_number} finished with result:"
-                            in lines[sub_idx]
-                        ):
-                            results_line = lines[sub_idx]
-                            sub_idx += 1
-
-                            while "targets:" not in lines[sub_idx]:
-                                sub_idx += 1
-                            targets_line = (
-                                lines[sub_idx].split("targets:")[1].strip().strip("[]")
-                            )
-
-                            while "weights:" not in lines[sub_idx]:
-                                sub_idx += 1
-                            weights_line = (
-                                lines[sub_idx].split("weights:")[1].strip().strip("[]")
-                            )
-
-                            results = float(results_line.split("result:")[1].strip())
-                            targets_str = [
-                                val.strip()
-                                for val in targets_line.split(",")
-                                if val.strip()
-                            ]
-                            weights_str = [
-                                val.strip()
-                                for val in weights_line.split(",")
-                                if val.strip()
-                            ]
-
-                            try:
-                                targets = [float(val) for val in targets_str]
-                                weights = [float(val) for val in weights_str]
-                                extracted_data.append(
-                                    (results, trial_number, targets, weights)
-                                )
-                            except ValueError as e:
-                                sys.stdout.write(
-                                    f"Error processing line: {sub_idx}, error: {e}\n"
-                                )
-
-                    with open(output_path, "w", newline="") as csvfile:
-                        writer = csv.writer(csvfile)
-                        writer.writerow(
-                            [
-                                f"{ob.formula}",
-                                "Trial",
-                                f"{ob.evaluator_flags}",
-                                f"{ob.calculator.selected_columns}",
-                            ]
-                        )
-                        for data in extracted_data:
-                            writer.writerow(
-                                [data[0], data[1], str(data[2]), str(data[3])]
-                            )
+            with open(file_path, "rb") as file:
+                file.seek(position)
+                new_content = file.read()
+            position += len(new_content)
         except FileNotFoundError:
-            pass
-        time.sleep(refresh_rate)
+            new_content = b""
+
+        # Only complete lines are decoded, so a line or character still being written is
+        # left for the next poll.
+        content = partial_line + new_content
+        complete_content, _, partial_line = content.rpartition(b"\n")
+        new_lines = complete_content.decode("utf-8", errors="replace").split("\n")
+        extracted_data: List[Tuple[float, int, np.ndarray, np.ndarray]] = []
+
+        for line in new_lines:
+            match = _RESULT_LINE.search(line)
+            if match is not None:
+                trial_number = int(match.group(1))
+                trial_fields[trial_number] = [match.group(2)]
+                awaiting_targets.append(trial_number)
+                continue
+
+            match = _VALUES_LINE.search(line)
+            if match is not None:
+                if match.group(1) == "targets":
+                    for trial_number in awaiting_targets:
+                        trial_fields[trial_number].append(match.group(2))
+                    awaiting_weights.extend(awaiting_targets)
+                    awaiting_targets.clear()
+                else:
+                    for trial_number in awaiting_weights:
+                        trial_fields[trial_number].append(match.group(2))
+                    awaiting_weights.clear()
+                continue
+
+            match = _BEST_LINE.search(line)
+            if match is None:
+                continue
+            trial_number = int(match.group(1))
+            if trial_number in best_trials:
+                continue
+            fields = trial_fields.get(trial_number)
+            if fields is None or len(fields) < 3:
+                continue
+
+            best_trials.add(trial_number)
+            results_str, targets_str, weights_str = fields
+
+            try:
+                results = float(results_str)
+                targets = _parse_values(targets_str)
+                weights = _parse_values(weights_str)
+                extracted_data.append((results, trial_number, targets, weights))
+            except ValueError as e:
+                sys.stdout.write(
+                    f"Error processing trial: {trial_number}, error: {e}\n"
+                )
+
+        if extracted_data:
+            with open(output_path, "a" if csv_started else "w", newline="") as csvfile:
+                writer = csv.writer(csvfile)
+                if not csv_started:
+                    writer.writerow(
+                        [
+                            f"{ob.formula}",
+                            "Trial",
+                            f"{ob.evaluator_flags}",
+                            f"{ob.calculator.selected_columns}",
+                        ]
+                    )
+                    csv_started = True
+                for data in extracted_data:
+                    writer.writerow(
+                        [
+                            data[0],
+                            data[1],
+                            str(data[2].tolist()),
+                            str(data[3].tolist()),
+                        ]
+                    )
+        if stopping:
+            return
+        stop_event.wait(refresh_rate)
 
 
 def optimize_run(
     multiple_objective: MultipleObjective,
     n_trials: int,
     parallel: Union[bool, int] = True,
+    backend: str = "loky",
 ) -> None:
     """
     Optimize the multiple objective in parallel using specified number of processors or all available ones.
@@ -128,20 +186,37 @@ def optimize_run(
     Args:
         multiple_objective (MultipleObjective): The multiple objective instance to be optimized.
         n_trials (int): Total number of trials for optimization, distributed across cores.
-        parallel (Union[bool, int]): If True, use all available cores. If False, don't use parallelism.
-                                    If int, use the specified number of cores.
+        parallel (Union[bool, int]): If True, use all available cores. If False or 1, optimize in this
+                                    process. If int, use the specified number of cores.
+        backend (str): The joblib backend running the workers. "loky" pickles the objective into
+                       separate processes; "threading" shares it between threads without copying the
+                       data, but the evaluations of the trials then run one at a time. Defaults to "loky".
 
     Returns:
         None
+
+    Raises:
+        ValueError: If the study is kept in memory but would be optimized in separate processes,
+                    where each worker would only fill its own copy of the study.
     """
     ob = multiple_objective
+    # True == 1, so booleans are told apart from a worker count of 1 explicitly.
+    sequential = parallel is False or (not isinstance(parallel, bool) and parallel == 1)
+    if not sequential and backend != "threading" and ob.storage == "memory":
+        raise ValueError(
+            "An in-memory study cannot be shared between processes; "
+            'use storage="journal", an RDB URL or backend="threading".'
+        )
+    stop_listener = threading.Event()
     log_listener_thread = threading.Thread(
-        target=get_best_trials, args=(multiple_objective,)
+        target=get_best_trials,
+        args=(multiple_objective,),
+        kwargs={"stop_event": stop_listener},
     )
     log_listener_thread.daemon = True
     log_listener_thread.start()
 
-    if isinstance(parallel, bool) and not parallel:
+    if sequential:
         multiple_objective.optimize(n_trials)
     else:
         n_cores = (
@@ -149,10 +224,12 @@ def optimize_run(
         )
         unit_n_trials = n_trials // n_cores
 
-        Parallel(n_jobs=n_cores)(
+        Parallel(n_jobs=n_cores, backend=backend)(
             delayed(parallel_optimize)(ob, i, unit_n_trials) for i in range(n_cores)
         )
-    ob.best_params = np.asarray(list(ob.study.best_params.values()))
+    stop_listener.set()
+    log_listener_thread.join()
+    ob.best_params = ob.get_best_params()
     save_study(ob)
     if not ob.save_study:
-        subprocess.run(["rm", "-rf", ob.full_path])
+        shutil.rmtree(ob.full_path, ignore_errors=True)
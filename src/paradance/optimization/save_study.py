@@ -13,30 +13,29 @@ def save_multiple_objective_info(ob: MultipleObjective, filename: str) -> None:
         filename (str): The name of the txt file.
     """
 
+    lines = [
+        f"Study Name: {ob.study_name}\n",
+        "-" * 50 + "\n",
+        f"Formula: {ob.formula}\n",
+        f"Selected Columns: {ob.calculator.selected_columns}\n",
+        f"Direction: {ob.direction}\n",
+        f"Weights Number: {ob.weights_num}\n",
+        f"equation_type: {ob.calculator.equation_type}\n",
+        "\nEvaluators Info:\n",
+        "-" * 50 + "\n",
+    ]
+    for evaluator in ob.evaluators:
+        lines.append(
+            f"Flag: {evaluator.flag.name.lower()}\n"
+            f"Target Column: {evaluator.target_column}\n"
+            f"Hyperparameter: {evaluator.hyperparameter}\n"
+            f"Evaluator Property: {evaluator.evaluator_property}\n"
+            f"Groupby: {evaluator.groupby}\n"
+            "\n"
+        )
+
     with open(filename, "w") as file:
-        file.write(f"Study Name: {ob.study_name}\n")
-        file.write("-" * 50 + "\n")
-        file.write(f"Formula: {ob.formula}\n")
-        file.write(f"Selected Columns: {ob.calculator.selected_columns}\n")
-        file.write(f"Direction: {ob.direction}\n")
-        file.write(f"Weights Number: {ob.weights_num}\n")
-        file.write(f"equation_type: {ob.calculator.equation_type}\n")
-
-        file.write("\nEvaluators Info:\n")
-        file.write("-" * 50 + "\n")
-        for flag, target_column, hyperparameter, evaluator_property, groupby in zip(
-            ob.evaluator_flags,
-            ob.target_columns,
-            ob.hyperparameters,
-            ob.evaluator_propertys,
-            ob.groupbys,
-        ):
-            file.write(f"Flag: {flag}\n")
-            file.write(f"Target Column: {target_column}\n")
-            file.write(f"Hyperparameter: {hyperparameter}\n")
-            file.write(f"Evaluator Property: {evaluator_property}\n")
-            file.write(f"Groupby: {groupby}\n")
-            file.write("\n")
+        file.writelines(lines)
 
 
 def save_study(multiple_objective: MultipleObjective) -> None:
@@ -55,4 +54,4 @@ def save_study(multiple_objective: MultipleObjective) -> None:
     save_multiple_objective_info(ob, f"{ob.full_path}/objective_info.txt")
     ob.study.trials_dataframe().to_csv(f"{ob.full_path}/paradance_full_trials.csv")
     with open(f"{ob.full_path}/study.pkl", "wb") as f:
-        pickle.dump(ob.study, f)
+        pickle.dump(ob.study, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -28,7 +28,6 @@ def ensure_study_directory(study_path: Optional[str], study_name: Optional[str])
 
     full_path = os.path.join(study_path, study_name)
 
-    if not os.path.exists(full_path):
-        os.makedirs(full_path)
+    os.makedirs(full_path, exist_ok=True)
 
     return os.path.abspath(full_path)
@@ -1,7 +1,217 @@
-from typing import List
+import math
+import weakref
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ..jit import NUMBA_AVAILABLE, njit, prange
+
+# Fast-math flags without nnan/ninf: rows containing zeros have a log sum of -inf.
+_FASTMATH_FLAGS = {"nsz", "arcp", "contract", "afn", "reassoc"}
+# The search loop is bandwidth bound, so the row log sums are stored in single
+# precision while every mean is still accumulated in double precision.
+_LOG_SUM_DTYPE = np.float32
+# Natural logs of columns keyed by the id of their dataframe and the column name. Each
+# entry keeps a weak reference to its dataframe, because CPython reuses the id of a
+# freed dataframe for the next one allocated.
+LogCache = Dict[Tuple[int, str], Tuple["weakref.ref[pd.DataFrame]", np.ndarray]]
+
+
+def _column_logs(dataframe: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Reads the given columns as float64 and takes their natural logs.
+
+    Args:
+        dataframe (pd.DataFrame): The DataFrame containing the data.
+        columns (List[str]): List of column names to read.
+
+    Returns:
+        np.ndarray: The logs, one column per name, with -inf for zeros and NaN kept as NaN.
+
+    Raises:
+        ValueError: If any of the columns holds a negative value, whose log is undefined.
+    """
+    values = dataframe[columns].to_numpy(dtype=np.float64)
+    negative = (values < 0).any(axis=0)
+    if negative.any():
+        negative_columns = [column for column, flag in zip(columns, negative) if flag]
+        raise ValueError(
+            f"Columns {negative_columns} contain negative values; "
+            "the mean can only be stabilized for non-negative columns."
+        )
+    with np.errstate(divide="ignore"):
+        logs: np.ndarray = np.log(values)
+    return logs
+
+
+def _row_log_sum(
+    dataframe: pd.DataFrame,
+    columns: List[str],
+    log_cache: Optional[LogCache] = None,
+) -> np.ndarray:
+    """
+    Computes the row-wise sum of the logarithms of the given columns.
+
+    Args:
+        dataframe (pd.DataFrame): The DataFrame containing the data.
+        columns (List[str]): List of column names whose values are multiplied together.
+        log_cache (Optional[LogCache], optional): Natural logs of columns keyed by ``(id(dataframe), column)``,
+            reused when they belong to this dataframe and filled in otherwise. Defaults to None.
+
+    Returns:
+        np.ndarray: The log of the row-wise product, skipping NaN like pandas' prod.
+
+    Raises:
+        ValueError: If any of the columns holds a negative value, or a cached column does not have one
+            log per row of the dataframe.
+    """
+    if not columns:
+        return np.zeros(len(dataframe), dtype=_LOG_SUM_DTYPE)
+    if log_cache is None:
+        logs = _column_logs(dataframe, columns)
+    else:
+        frame_id = id(dataframe)
+        missing = [
+            column
+            for column in columns
+            if (frame_id, column) not in log_cache
+            or log_cache[frame_id, column][0]() is not dataframe
+        ]
+        if missing:
+            frame_ref = weakref.ref(dataframe)
+            missing_logs = _column_logs(dataframe, missing)
+            for i, column in enumerate(missing):
+                log_cache[frame_id, column] = (frame_ref, missing_logs[:, i])
+        column_logs = [log_cache[frame_id, column][1] for column in columns]
+        if any(len(cached) != len(dataframe) for cached in column_logs):
+            raise ValueError(
+                "log_cache holds logs that do not match the rows of the dataframe; "
+                "drop the cache once a cached dataframe changes."
+            )
+        logs = np.column_stack(column_logs)
+    return np.asarray(np.nansum(logs, axis=1), dtype=_LOG_SUM_DTYPE)
+
+
+@njit(parallel=True, fastmath=_FASTMATH_FLAGS, cache=True)
+def _mean_exp_kernel(
+    exponent: float, keep_log_sum: np.ndarray, fixed_log_sum: np.ndarray
+) -> float:
+    """
+    Computes the mean of exp(exponent * keep_log_sum + fixed_log_sum) in one pass.
+
+    Args:
+        exponent (float): The exponent applied to the keep columns.
+        keep_log_sum (np.ndarray): Row-wise log sums of the columns raised to the exponent.
+        fixed_log_sum (np.ndarray): Row-wise log sums of the columns left untouched.
+
+    Returns:
+        float: The mean of the transformed row-wise product.
+    """
+    size = keep_log_sum.size
+    if size == 0:
+        return np.nan
+    total = 0.0
+    for i in prange(size):
+        total += math.exp(exponent * keep_log_sum[i] + fixed_log_sum[i])
+    return total / size
+
+
+def _transformed_mean(
+    exponent: float,
+    keep_log_sum: np.ndarray,
+    fixed_log_sum: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> float:
+    """
+    Computes the mean product after raising the keep columns to the exponent.
+
+    Args:
+        exponent (float): The exponent applied to the keep columns.
+        keep_log_sum (np.ndarray): Row-wise log sums of the columns raised to the exponent.
+        fixed_log_sum (np.ndarray): Row-wise log sums of the columns left untouched.
+        out (Optional[np.ndarray], optional): A scratch buffer shaped like keep_log_sum. Defaults to None,
+            in which case a new buffer is allocated.
+
+    Returns:
+        float: The mean of the transformed row-wise product.
+    """
+    if exponent == 0:
+        # x ** 0 is 1 even for zeros, whose log of -inf would turn the product into NaN.
+        keep_log_sum = np.zeros_like(keep_log_sum)
+    if NUMBA_AVAILABLE:
+        return float(_mean_exp_kernel(exponent, keep_log_sum, fixed_log_sum))
+    if out is None:
+        out = np.empty_like(keep_log_sum)
+    np.multiply(keep_log_sum, exponent, out=out)
+    out += fixed_log_sum
+    np.exp(out, out=out)
+    return float(out.mean(dtype=np.float64))
+
+
+def _bisect_exponent(
+    keep_log_sum: np.ndarray,
+    fixed_log_sum: np.ndarray,
+    target_mean: float,
+    tolerance: float,
+    low: float,
+    high: float,
+) -> float:
+    """
+    Searches for the exponent whose transformed mean matches the target mean.
+
+    The bracket is narrowed with Illinois-style secant steps on the log of the
+    transformed mean, which is close to linear in the exponent. Whenever the
+    secant point falls outside the bracket a bisection step is taken instead.
+
+    Args:
+        keep_log_sum (np.ndarray): Row-wise log sums of the columns raised to the exponent.
+        fixed_log_sum (np.ndarray): Row-wise log sums of the columns left untouched.
+        target_mean (float): The mean the transformed product should reach.
+        tolerance (float): Tolerance for both the mean difference and the interval width.
+        low (float): The lower bound of the search interval.
+        high (float): The upper bound of the search interval.
+
+    Returns:
+        float: The exponent found once the means agree or the interval is exhausted.
+    """
+
+    def log_error(exponent: float) -> Tuple[float, float]:
+        transformed_mean = _transformed_mean(
+            exponent, keep_log_sum, fixed_log_sum, out=buffer
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return transformed_mean, float(np.log(transformed_mean) - log_target)
+
+    buffer = np.empty_like(keep_log_sum)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_target = np.log(target_mean)
+    n_iter = int(math.ceil(math.log2(max(high - low, tolerance) / tolerance))) + 1
+    error_low = log_error(low)[1]
+    error_high = log_error(high)[1]
+    last_side = 0
+    mid = (low + high) / 2
+    for _ in range(n_iter):
+        mid = (low + high) / 2
+        if error_high != error_low:
+            secant = low - error_low * (high - low) / (error_high - error_low)
+            if low < secant < high:
+                mid = secant
+        transformed_mean, error = log_error(mid)
+        if abs(transformed_mean - target_mean) < tolerance:
+            return mid
+        elif transformed_mean < target_mean:
+            low, error_low = mid, error
+            if last_side < 0:
+                error_high /= 2
+            last_side = -1
+        else:
+            high, error_high = mid, error
+            if last_side > 0:
+                error_low /= 2
+            last_side = 1
+    return mid
+
 
 def stabilize_mean_with_exponents(
     dataframe: pd.DataFrame,
@@ -12,6 +222,7 @@ def stabilize_mean_with_exponents(
     tolerance: float = 1e-6,
     low: float = 0.0,
     high: float = 5.0,
+    log_cache: Optional[LogCache] = None,
 ) -> float:
     """
     Adjusts the values in the dataframe to stabilize the mean of the product of specified columns
@@ -26,30 +237,25 @@ def stabilize_mean_with_exponents(
         tolerance (float, optional): The tolerance for the difference between the current and target means in the optimization process. Defaults to 1e-6.
         low (float, optional): The lower bound of the search interval for finding the optimal exponent. Defaults to 0.0.
         high (float, optional): The upper bound of the search interval for finding the optimal exponent. Defaults to 5.0.
+        log_cache (Optional[LogCache], optional): Natural logs of the columns keyed by ``(id(dataframe), column)``,
+            shared across calls. The dataframe must not be modified while the cache is in use. Defaults to None.
 
     Returns:
         float: The deboost ratio for the keep_columns that stabilizes the mean of the product of all the columns.
+
+    Raises:
+        ValueError: If any of the columns holds a negative value, or the dataframe changed its
+            number of rows while its logs were held in `log_cache`.
     """
-    dataframe_tmp = dataframe.copy()
-    for column in boost_columns:
-        dataframe_tmp[column] = dataframe_tmp[column] ** boost_scale
-    target_mean = (
-        dataframe[keep_columns + boost_columns].prod(axis=1).mean() + compensation
+    # Only the needed columns are read into NumPy arrays. Nothing is written
+    # back, so no copy of the whole frame is required.
+    keep_log_sum = _row_log_sum(dataframe, keep_columns, log_cache)
+    boost_log_sum = _row_log_sum(dataframe, boost_columns, log_cache)
+    target_mean = _transformed_mean(1.0, keep_log_sum, boost_log_sum) + compensation
+    boost_log_sum *= boost_scale
+    return _bisect_exponent(
+        keep_log_sum, boost_log_sum, target_mean, tolerance, low, high
     )
-    while low <= high:
-        mid = (low + high) / 2
-        for column in keep_columns:
-            dataframe_tmp[column] = dataframe[column] ** mid
-        transformed_mean = (
-            dataframe_tmp[keep_columns + boost_columns].prod(axis=1).mean()
-        )
-        if abs(transformed_mean - target_mean) < tolerance:
-            return mid
-        elif transformed_mean < target_mean:
-            low = mid + tolerance
-        else:
-            high = mid - tolerance
-    return mid
 
 
 def stabilize_mean_with_additional_factors(
@@ -60,6 +266,7 @@ def stabilize_mean_with_additional_factors(
     tolerance: float = 1e-6,
     low: float = 0.0,
     high: float = 5.0,
+    log_cache: Optional[LogCache] = None,
 ) -> float:
     """
     Stabilizes the mean of the product of specified columns in a DataFrame with additional factors.
@@ -72,23 +279,21 @@ def stabilize_mean_with_additional_factors(
         tolerance (float, optional): Tolerance level for mean stabilization. Defaults to 1e-6.
         low (float, optional): Lower bound of the exponent search interval. Defaults to 0.0.
         high (float, optional): Upper bound of the exponent search interval. Defaults to 5.0.
+        log_cache (Optional[LogCache], optional): Natural logs of the columns keyed by ``(id(dataframe), column)``,
+            shared across calls. The dataframe must not be modified while the cache is in use. Defaults to None.
 
     Returns:
         float: The exponent value that stabilizes the mean within the specified tolerance.
+
+    Raises:
+        ValueError: If any of the columns holds a negative value, or the dataframe changed its
+            number of rows while its logs were held in `log_cache`.
     """
-    dataframe_tmp = dataframe.copy()
-    target_mean = dataframe[keep_columns].prod(axis=1).mean() + compensation
-    while low <= high:
-        mid = (low + high) / 2
-        for column in keep_columns:
-            dataframe_tmp[column] = dataframe[column] ** mid
-        transformed_mean = (
-            dataframe_tmp[keep_columns + additional_columns].prod(axis=1).mean()
-        )
-        if abs(transformed_mean - target_mean) < tolerance:
-            return mid
-        elif transformed_mean < target_mean:
-            low = mid + tolerance
-        else:
-            high = mid - tolerance
-    return mid
+    # Only the needed columns are read into NumPy arrays. Nothing is written
+    # back, so no copy of the whole frame is required.
+    keep_log_sum = _row_log_sum(dataframe, keep_columns, log_cache)
+    target_mean = float(np.exp(keep_log_sum).mean(dtype=np.float64)) + compensation
+    additional_log_sum = _row_log_sum(dataframe, additional_columns, log_cache)
+    return _bisect_exponent(
+        keep_log_sum, additional_log_sum, target_mean, tolerance, low, high
+    )
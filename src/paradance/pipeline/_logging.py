@@ -0,0 +1,9 @@
+import logging
+
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%H:%M:%S",
+    )
+logger = logging.getLogger("paradance.pipeline")
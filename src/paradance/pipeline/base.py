@@ -1,4 +1,3 @@
-import logging
 from abc import ABCMeta, abstractmethod
 from itertools import zip_longest
 from typing import Dict, Optional, Union
@@ -8,13 +7,7 @@ import pandas as pd
 from ..dataloader import CSVLoader, ExcelLoader, load_config
 from ..evaluation import Calculator, LogarithmPCACalculator
 from ..optimization import MultipleObjective, optimize_run
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%H:%M:%S",
-)
-logger = logging.getLogger(__name__)
+from ._logging import logger
 
 
 class BasePipeline(metaclass=ABCMeta):
@@ -26,6 +19,7 @@ class BasePipeline(metaclass=ABCMeta):
 
     Attributes:
         config (Dict): Configuration settings loaded from a configuration file.
+        file_type (str): Type of the file to load data from, 'csv' or 'xlsx'.
         n_trials (int): The number of optimization trials to perform.
 
     """
@@ -38,7 +32,10 @@ class BasePipeline(metaclass=ABCMeta):
     ) -> None:
         self.dataframe = dataframe
         self.config: Dict = load_config(config_path)
+        self.file_type = self.config.get("DataLoader", {}).get("file_type", "csv")
         self.n_trials = n_trials
+        self._prepared = False
+        self._ran = False
 
     def _load_dataset(self) -> None:
         """Loads the dataset based on the file type specified in the configuration.
@@ -46,19 +43,17 @@ class BasePipeline(metaclass=ABCMeta):
         Supports loading from CSV and Excel files.
         """
         if self.dataframe is None:
-            self.file_type = self.config["DataLoader"].get("file_type", "csv")
             selected_columns = self.config["Calculator"].get("selected_columns", None)
             config = self.config["DataLoader"]
             config["clean_zero_columns"] = selected_columns
-            if self.dataframe is None:
-                if self.file_type == "csv":
-                    self.dataframe = CSVLoader(
-                        config=config,
-                    ).df
-                elif self.file_type == "xlsx":
-                    self.dataframe = ExcelLoader(
-                        config=config,
-                    ).df
+            if self.file_type == "csv":
+                self.dataframe = CSVLoader(
+                    config=config,
+                ).df
+            elif self.file_type == "xlsx":
+                self.dataframe = ExcelLoader(
+                    config=config,
+                ).df
 
     @abstractmethod
     def _load_calculator(self) -> Union[Calculator, LogarithmPCACalculator]:
@@ -80,12 +75,14 @@ class BasePipeline(metaclass=ABCMeta):
 
     def _add_evaluators(self) -> None:
         """Adds evaluators for optimization based on configuration settings."""
-        flags = self.config["Evaluator"].get("flags", None)
-        target_columns = self.config["Evaluator"].get("target_columns", [])
-        mask_columns = self.config["Evaluator"].get("mask_columns", [])
-        hyperparameters = self.config["Evaluator"].get("hyperparameters", [])
-        evaluator_propertys = self.config["Evaluator"].get("evaluator_propertys", [])
-        groupbys = self.config["Evaluator"].get("groupbys", [])
+        evaluator_config = self.config["Evaluator"]
+        flags = evaluator_config.get("flags", None)
+        target_columns = evaluator_config.get("target_columns", [])
+        mask_columns = evaluator_config.get("mask_columns", [])
+        hyperparameters = evaluator_config.get("hyperparameters", [])
+        evaluator_propertys = evaluator_config.get("evaluator_propertys", [])
+        groupbys = evaluator_config.get("groupbys", [])
+        add_evaluator = self.objective.add_evaluator
         for (
             flag,
             target_column,
@@ -101,7 +98,7 @@ class BasePipeline(metaclass=ABCMeta):
             evaluator_propertys,
             groupbys,
         ):
-            self.objective.add_evaluator(
+            add_evaluator(
                 flag=flag,
                 target_column=target_column,
                 mask_column=mask_column,
@@ -134,6 +131,7 @@ class BasePipeline(metaclass=ABCMeta):
         calculator = self._load_calculator()
         self._add_objective(calculator)
         self._add_evaluators()
+        self._prepared = True
 
     def run(self) -> None:
         """
@@ -141,7 +139,13 @@ class BasePipeline(metaclass=ABCMeta):
 
         This method handles the entire flow of running the optimization after
         performing all pre-run setup tasks. It concludes with displaying the results.
+        The setup is skipped if it already ran, e.g. in a subclass constructor, and
+        calling `run` again once the optimization has finished does nothing.
         """
-        self._pre_run()
+        if self._ran:
+            return
+        if not self._prepared:
+            self._pre_run()
         self._optimize()
         self.show_results()
+        self._ran = True
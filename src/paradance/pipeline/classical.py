@@ -1,17 +1,10 @@
-import logging
 from typing import Optional, Union
 
 import pandas as pd
 
 from ..evaluation import Calculator, LogarithmPCACalculator
 from ..pipeline import BasePipeline
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%H:%M:%S",
-)
-logger = logging.getLogger(__name__)
+from ._logging import logger
 
 
 class ClassicalPipeline(BasePipeline):
@@ -65,9 +58,14 @@ class ClassicalPipeline(BasePipeline):
         """Displays the results of the calculation.
 
         Logs information about the selected columns, first order weights, and
-        power weights based on the calculations performed.
+        power weights based on the calculations performed, preceded by the
+        Dirichlet weights when the objective builds them.
         """
-        best_params = list(self.objective.study.best_params.values())
+        best_params = self.objective.best_params.tolist()
+        dirichlet_weights = None
+        if self.objective.uses_dirichlet_weights:
+            dirichlet_weights = best_params[: self.objective.weights_num]
+            best_params = best_params[self.objective.weights_num :]
         if not (self.objective.first_order):
             first_order_weights = None
             power_weights = best_params
@@ -82,5 +80,7 @@ class ClassicalPipeline(BasePipeline):
             power_weights = None
 
         logger.info(f"Selected columns: {self.calculator.selected_columns}")
+        if dirichlet_weights is not None:
+            logger.info(f"Dirichlet weights: {dirichlet_weights}")
         logger.info(f"First order weights: {first_order_weights}")
         logger.info(f"Power weights: {power_weights}")
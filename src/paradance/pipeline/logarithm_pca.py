@@ -1,20 +1,12 @@
-import logging
 from typing import Optional, Union
 
 import numpy as np
 import pandas as pd
-from mixician import SelfBalancingLogarithmPCACalculator
 
 from ..evaluation import Calculator, LogarithmPCACalculator
+from ._logging import logger
 from .base import BasePipeline
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%H:%M:%S",
-)
-logger = logging.getLogger(__name__)
-
 
 class LogarithmPCAPipeline(BasePipeline):
     """Pipeline for processing and optimizing PCA with logarithmic transformations.
@@ -49,6 +41,8 @@ class LogarithmPCAPipeline(BasePipeline):
 
     def _load_calculator(self) -> Union[Calculator, LogarithmPCACalculator]:
         """Initializes the PCA calculator with the loaded dataset."""
+        from mixician import SelfBalancingLogarithmPCACalculator
+
         pca_calculator = SelfBalancingLogarithmPCACalculator(
             dataframe=self.dataframe,
             config=self.config["Calculator"],
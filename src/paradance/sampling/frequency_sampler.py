@@ -1,4 +1,3 @@
-from collections import Counter
 from typing import List, Optional, Union
 
 import numpy as np
@@ -26,18 +25,28 @@ class FrequencySampler(BaseSampler):
         )
 
     def sample(self) -> dict:
+        self.data = np.asarray(self.data, dtype=np.float64)
+        mask = np.ones(len(self.data), dtype=bool)
         if self.slice_from is not None:
-            self.data = [x for x in self.data if x > self.slice_from]
+            mask &= self.data > self.slice_from
         if self.slice_to is not None:
-            self.data = [x for x in self.data if x <= self.slice_to]
+            mask &= self.data <= self.slice_to
+        self.data = self.data[mask]
 
-        # calculate the percentiles that will give us the required sample size
-        percentiles = np.linspace(0, 100, self.sample_size + 2)[1:-1]
-        samples = np.percentile(self.data, percentiles)
+        # equispaced percentiles are linear interpolations between order statistics,
+        # so only those order statistics are selected instead of sorting everything
+        positions = np.linspace(0, len(self.data) - 1, self.sample_size + 2)[1:-1]
+        order_statistics = np.union1d(
+            np.floor(positions).astype(np.intp), np.ceil(positions).astype(np.intp)
+        )
+        partitioned = np.partition(self.data, order_statistics)
+        samples = np.interp(positions, order_statistics, partitioned[order_statistics])
         if self.log_scale:
-            samples = [np.exp(x) for x in samples]
-        else:
-            samples = [x for x in samples]
+            np.exp(samples, out=samples)
         if self.laplace_smoothing:
-            samples = [x - 1 for x in samples]
-        return dict(Counter(samples))
+            samples -= 1
+        # the samples are already ascending, so duplicates can only be neighbours
+        if np.all(samples[1:] != samples[:-1]):
+            return dict.fromkeys(samples.tolist(), 1)
+        values, counts = np.unique(samples, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
@@ -1,10 +1,150 @@
 from typing import Dict, List
 
 import matplotlib.pyplot as plt
+import numpy as np
+from joblib import Parallel, delayed
 from pandas import DataFrame
 from scipy.stats import kendalltau
 
-from ..evaluation import map_to_bins
+from ..jit import NUMBA_AVAILABLE, njit, prange
+
+
+@njit(cache=True)
+def _tied_pairs(sorted_values: np.ndarray) -> int:
+    """
+    Counts the pairs of equal values in a sorted array.
+
+    Args:
+        sorted_values (np.ndarray): The values, sorted so that equal values are adjacent.
+
+    Returns:
+        int: The number of tied pairs.
+    """
+    pairs = 0
+    run = 1
+    for i in range(1, len(sorted_values)):
+        if sorted_values[i] == sorted_values[i - 1]:
+            run += 1
+        else:
+            pairs += run * (run - 1) // 2
+            run = 1
+    return pairs + run * (run - 1) // 2
+
+
+@njit(cache=True)
+def _kendall_tau_b(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Computes Kendall's tau-b with Knight's O(n log n) algorithm.
+
+    The pairs are sorted by ``x`` then ``y`` and the discordant pairs are counted as the
+    swaps of a bottom-up merge sort of ``y``, matching ``scipy.stats.kendalltau``.
+
+    Args:
+        x (np.ndarray): The first ranking.
+        y (np.ndarray): The second ranking, of the same length.
+
+    Returns:
+        float: The tau-b coefficient, or NaN if it is undefined.
+    """
+    n = len(x)
+    if n < 2 or np.isnan(x).any() or np.isnan(y).any():
+        return np.nan
+    order = np.argsort(y, kind="mergesort")
+    order = order[np.argsort(x[order], kind="mergesort")]
+    x_sorted = x[order]
+    y_sorted = y[order]
+
+    x_ties = _tied_pairs(x_sorted)
+    joint_ties = 0
+    run = 1
+    for i in range(1, n):
+        if x_sorted[i] == x_sorted[i - 1] and y_sorted[i] == y_sorted[i - 1]:
+            run += 1
+        else:
+            joint_ties += run * (run - 1) // 2
+            run = 1
+    joint_ties += run * (run - 1) // 2
+
+    source = y_sorted
+    target = np.empty_like(y_sorted)
+    swaps = 0
+    width = 1
+    while width < n:
+        for start in range(0, n, 2 * width):
+            middle = min(start + width, n)
+            end = min(start + 2 * width, n)
+            i, j, k = start, middle, start
+            while i < middle and j < end:
+                if source[j] < source[i]:
+                    target[k] = source[j]
+                    swaps += middle - i
+                    j += 1
+                else:
+                    target[k] = source[i]
+                    i += 1
+                k += 1
+            while i < middle:
+                target[k] = source[i]
+                i += 1
+                k += 1
+            while j < end:
+                target[k] = source[j]
+                j += 1
+                k += 1
+        source, target = target, source
+        width *= 2
+    y_ties = _tied_pairs(source)
+
+    total = n * (n - 1) // 2
+    denominator = np.sqrt(float(total - x_ties) * float(total - y_ties))
+    if denominator == 0:
+        return np.nan
+    return float((total - x_ties - y_ties + joint_ties - 2 * swaps) / denominator)
+
+
+@njit(parallel=True, cache=True)
+def _slice_taus_kernel(
+    score_values: np.ndarray, factor_matrix: np.ndarray, bounds: np.ndarray
+) -> np.ndarray:
+    """
+    Computes Kendall's tau of every factor against the overall score in every slice.
+
+    Args:
+        score_values (np.ndarray): The overall scores, sorted in descending order.
+        factor_matrix (np.ndarray): The factor values of the same rows, one column per factor.
+        bounds (np.ndarray): The row boundaries of the slices.
+
+    Returns:
+        np.ndarray: The tau coefficients, shaped ``(num_slices, num_factors)``.
+    """
+    num_slices = len(bounds) - 1
+    num_factors = factor_matrix.shape[1]
+    taus = np.empty((num_slices, num_factors))
+    for task in prange(num_slices * num_factors):
+        i = task // num_factors
+        j = task % num_factors
+        start, end = bounds[i], bounds[i + 1]
+        taus[i, j] = _kendall_tau_b(
+            score_values[start:end], factor_matrix[start:end, j]
+        )
+    return taus
+
+
+def _slice_taus(
+    score_values: np.ndarray, factor_values: List[np.ndarray]
+) -> List[float]:
+    """
+    Computes Kendall's tau of each factor against the overall score within one slice.
+
+    Args:
+        score_values (np.ndarray): The overall scores of the rows in the slice.
+        factor_values (List[np.ndarray]): The values of each factor for the same rows.
+
+    Returns:
+        List[float]: The tau correlation coefficient of each factor, in the given order.
+    """
+    # Kendall's tau only depends on ranks, so the raw values are compared directly.
+    return [kendalltau(score_values, values)[0] for values in factor_values]
 
 
 def factor_influence_across_percentiles(
@@ -13,6 +153,7 @@ def factor_influence_across_percentiles(
     selected_columns: List[str],
     num_percentiles: int = 10,
     only_top_part: bool = False,
+    n_jobs: int = -1,
 ) -> Dict[str, List[float]]:
     """
     Evaluates the influence of selected factors on an overall score across defined percentiles of the data.
@@ -27,30 +168,39 @@ def factor_influence_across_percentiles(
         selected_columns (List[str]): A list of column names representing the factors to be evaluated.
         num_percentiles (int, optional): The number of equally-sized percentiles to divide the data into. Default is 10.
         only_top_part (bool, optional): If True, only the top percentile is considered for the analysis. Default is False.
+        n_jobs (int, optional): The number of threads computing the percentile slices in parallel when numba is
+            not installed. Default is -1, using all cores.
 
     Returns:
         Dict[str, List[float]]: A dictionary where keys are the column names from `selected_columns`
         and values are lists of tau correlation coefficients for each percentile.
     """
     n_rows = len(dataframe)
-    tau_dict = {}
-
-    dataframe = dataframe.sort_values(by=overall_score_column, ascending=False)
-
-    for target in selected_columns:
-        taus = []
-        for i in range(num_percentiles):
-            threshold = i / num_percentiles
-            start = int(threshold * n_rows)
-            end = int((threshold + 1 / num_percentiles) * n_rows)
-            subset = dataframe.iloc[start:end].copy()
-            subset["overall_score_bin"] = map_to_bins(subset[overall_score_column], 100)
-            subset[target + "_bin"] = map_to_bins(subset[target], 100)
-            tau, _ = kendalltau(subset["overall_score_bin"], subset[target + "_bin"])
-            taus.append(tau)
-            if only_top_part and i == 0:
-                break
-        tau_dict[target] = taus
+
+    score_values = dataframe[overall_score_column].to_numpy()
+    order = np.argsort(-score_values, kind="stable")
+    score_values = score_values[order]
+    factor_values = [dataframe[column].to_numpy()[order] for column in selected_columns]
+    bounds = np.linspace(0, n_rows, num_percentiles + 1, dtype=int)
+    num_slices = 1 if only_top_part else num_percentiles
+
+    if NUMBA_AVAILABLE:
+        slice_taus = _slice_taus_kernel(
+            score_values.astype(np.float64),
+            np.column_stack(factor_values).astype(np.float64),
+            bounds[: num_slices + 1],
+        ).tolist()
+    else:
+        slice_taus = Parallel(n_jobs=n_jobs, prefer="threads")(
+            delayed(_slice_taus)(
+                score_values[start:end], [values[start:end] for values in factor_values]
+            )
+            for start, end in zip(bounds[:num_slices], bounds[1 : num_slices + 1])
+        )
+    tau_dict = {
+        column: [taus[j] for taus in slice_taus]
+        for j, column in enumerate(selected_columns)
+    }
 
     if not only_top_part:
         plt.rcParams["axes.prop_cycle"] = plt.cycler(color=plt.cm.tab20.colors)
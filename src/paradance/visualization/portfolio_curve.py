@@ -1,9 +1,12 @@
-from typing import Iterable, List, Union, cast
+from typing import Dict, Iterable, List, Tuple, Union, cast
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
 
 from ..evaluation.calculator import Calculator
+from ..evaluation.portfolio_evaluator import compute_portfolio_concentrations
 
 
 class PortfolioPlotter:
@@ -42,61 +45,107 @@ class PortfolioPlotter:
         self.points_num = points_num
         self.minimal_expected_return = minimal_expected_return
         self.colors = colors
+        self._points_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        self._target_values: Dict[str, np.ndarray] = {}
+        self._cached_calculator = calculator
+        self._calculator_version = calculator.score_inputs_version
+
+    def _sync_with_calculator(self) -> None:
+        """Empty the caches if the calculator was replaced or one of its score inputs was assigned since they were filled."""
+        calculator = self.calculator
+        if (
+            self._cached_calculator is not calculator
+            or self._calculator_version != calculator.score_inputs_version
+        ):
+            self._points_cache.clear()
+            self._target_values.clear()
+            self._cached_calculator = calculator
+            self._calculator_version = calculator.score_inputs_version
 
     def _generate_points(self) -> None:
         """Generate points for plotting."""
         self.expected_returns = np.linspace(
             self.minimal_expected_return, 1, num=self.points_num, endpoint=True
         )
-        self.top_ratios = [
-            self.calculator.calculate_portfolio_concentration(
-                target_column=self.target_column, expected_return=er
-            )[1]
-            for er in self.expected_returns
-        ]
+        if self.target_column not in self._target_values:
+            self._target_values[self.target_column] = np.ascontiguousarray(
+                self.calculator.df[self.target_column].to_numpy()
+            )
+        _, concentrations = compute_portfolio_concentrations(
+            self.calculator.df["overall_score"].to_numpy(),
+            self._target_values[self.target_column],
+            self.expected_returns,
+        )
         self.expected_returns = self.expected_returns[::-1]
-        self.top_ratios = self.top_ratios[::-1]
-        self.top_ratios = [1 - ratio for ratio in self.top_ratios]
+        self.top_ratios = 1.0 - concentrations[::-1]
         self.expected_returns[0] = 1
         self.top_ratios[0] = 0
 
-    def _plot_single(self, weights_for_equation: List[float], color: str) -> None:
-        """Plot single portfolio curve.
+    def _curve_points(
+        self, weights_for_equation: List[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the points of a single portfolio curve.
 
         Args:
             weights_for_equation (List[float]): weights for equation
-            color (str): color for plotting curve
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: top ratios and expected returns of the curve
         """
-        self.calculator.get_overall_score(weights_for_equation)
-        self._generate_points()
-        plt.plot(self.top_ratios, self.expected_returns, color=color)
-        plt.fill_between(
-            self.top_ratios,
-            self.expected_returns,
-            y2=self.minimal_expected_return,
-            color=color,
-            alpha=0.1,
+        self._sync_with_calculator()
+        key = (
+            tuple(weights_for_equation),
+            self.target_column,
+            self.points_num,
+            self.minimal_expected_return,
         )
+        if key in self._points_cache:
+            self.top_ratios, self.expected_returns = self._points_cache[key]
+        else:
+            self.calculator.update_overall_score(weights_for_equation)
+            self._generate_points()
+            self._points_cache[key] = (self.top_ratios, self.expected_returns)
+        return self.top_ratios, self.expected_returns
 
     def plot(
         self, weights_for_equations: Union[List[float], List[List[float]]]
     ) -> None:
         """Plot portfolio curve.
 
+        All curves are drawn as one line collection and their filled areas as one
+        polygon collection.
+
         Args:
             weights_for_equations (Union[List[float], List[List[float]]]): weights for equations
         """
-        plt.figure(figsize=(10, 6))
         if isinstance(weights_for_equations[0], Iterable):
-            weights_for_equations = cast(List[List[float]], weights_for_equations)
-            for i, weights_for_equation in enumerate(weights_for_equations):
-                color = self.colors[i % len(self.colors)]
-                self._plot_single(weights_for_equation, color=color)
+            weights_list = cast(List[List[float]], weights_for_equations)
         else:
-            weights_for_equation = cast(List[float], weights_for_equations)
-            self._plot_single(weights_for_equation, self.colors[0])
-        plt.ylabel("Expected Return")
-        plt.xlabel("Portfolio Efficiency")
-        plt.title("Expected Return v.s. Portfolio Efficiency")
-        plt.grid(True)
+            weights_list = [cast(List[float], weights_for_equations)]
+        curves = [
+            self._curve_points(weights_for_equation)
+            for weights_for_equation in weights_list
+        ]
+        colors = [self.colors[i % len(self.colors)] for i in range(len(curves))]
+        lines = [np.column_stack(curve) for curve in curves]
+        baseline = np.full(self.points_num, self.minimal_expected_return)
+        areas = [
+            np.vstack([line, np.column_stack([line[::-1, 0], baseline])])
+            for line in lines
+        ]
+
+        _, ax = plt.subplots(figsize=(10, 6))
+        ax.add_collection(
+            PolyCollection(
+                areas,
+                facecolors=[to_rgba(color, alpha=0.1) for color in colors],
+                edgecolors="none",
+            )
+        )
+        ax.add_collection(LineCollection(lines, colors=colors))
+        ax.autoscale()
+        ax.set_ylabel("Expected Return")
+        ax.set_xlabel("Portfolio Efficiency")
+        ax.set_title("Expected Return v.s. Portfolio Efficiency")
+        ax.grid(True)
         plt.show()
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from paradance.evaluation import Calculator
+
+
+@pytest.fixture
+def dataframe() -> pd.DataFrame:
+    """A small dataframe with tied scores, binary labels, masks and user groups."""
+    rng = np.random.default_rng(0)
+    n_rows = 400
+    return pd.DataFrame(
+        {
+            # Rounded factors produce many tied overall scores.
+            "factor_a": np.round(rng.uniform(0.1, 1.0, n_rows), 1),
+            "factor_b": np.round(rng.uniform(0.1, 1.0, n_rows), 1),
+            "click": rng.integers(0, 2, n_rows),
+            "like": rng.integers(0, 2, n_rows),
+            "revenue": rng.exponential(1.0, n_rows),
+            "mask_half": np.arange(n_rows) % 2,
+            "user": rng.integers(0, 12, n_rows),
+        }
+    )
+
+
+@pytest.fixture
+def calculator(dataframe: pd.DataFrame) -> Calculator:
+    """A calculator whose overall score is the product of the two factor columns."""
+    calculator = Calculator(df=dataframe, selected_columns=["factor_a", "factor_b"])
+    calculator.get_overall_score([1.0, 1.0])
+    return calculator
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import kendalltau
+
+from paradance.visualization import factor_influence
+from paradance.visualization.factor_influence import (
+    _kendall_tau_b,
+    _slice_taus,
+    _slice_taus_kernel,
+    factor_influence_across_percentiles,
+)
+
+
+@pytest.mark.parametrize("n_rows", [2, 3, 17, 256, 1000])
+def test_kendall_tau_b_matches_scipy_with_ties(n_rows: int) -> None:
+    rng = np.random.default_rng(n_rows)
+    x = rng.integers(0, 5, n_rows).astype(np.float64)
+    y = (x + rng.integers(-2, 3, n_rows)).astype(np.float64)
+    assert _kendall_tau_b(x, y) == pytest.approx(kendalltau(x, y)[0], nan_ok=True)
+
+
+def test_kendall_tau_b_undefined_cases() -> None:
+    assert np.isnan(_kendall_tau_b(np.array([1.0]), np.array([2.0])))
+    assert np.isnan(_kendall_tau_b(np.ones(5), np.arange(5.0)))
+    assert np.isnan(_kendall_tau_b(np.array([1.0, np.nan]), np.array([1.0, 2.0])))
+
+
+def test_slice_taus_kernel_matches_per_slice() -> None:
+    rng = np.random.default_rng(0)
+    n_rows = 500
+    score_values = np.sort(np.round(rng.uniform(size=n_rows), 2))[::-1].copy()
+    factor_matrix = np.column_stack(
+        [
+            np.round(score_values + rng.normal(0, 0.1, n_rows), 1),
+            rng.integers(0, 3, n_rows).astype(np.float64),
+            np.ones(n_rows),
+        ]
+    )
+    bounds = np.linspace(0, n_rows, 11, dtype=int)
+    taus = _slice_taus_kernel(score_values, factor_matrix, bounds)
+    for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        expected = _slice_taus(
+            score_values[start:end], list(factor_matrix[start:end].T)
+        )
+        np.testing.assert_allclose(taus[i], expected, equal_nan=True)
+
+
+def test_numba_and_joblib_paths_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = np.random.default_rng(1)
+    dataframe = pd.DataFrame(
+        {
+            "score": np.round(rng.uniform(size=300), 2),
+            "a": rng.integers(0, 4, 300),
+            "b": np.round(rng.normal(size=300), 1),
+        }
+    )
+    kwargs = dict(
+        overall_score_column="score",
+        selected_columns=["a", "b"],
+        num_percentiles=4,
+        only_top_part=True,
+    )
+    result = factor_influence_across_percentiles(dataframe, **kwargs)
+    monkeypatch.setattr(factor_influence, "NUMBA_AVAILABLE", False)
+    expected = factor_influence_across_percentiles(dataframe, **kwargs)
+    assert result.keys() == expected.keys()
+    for column in expected:
+        np.testing.assert_allclose(result[column], expected[column])
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+
+from paradance.evaluation import Calculator
+from paradance.optimization import MultipleObjective, multiple_objective
+from paradance.optimization.construct_weights import (
+    construct_power_weights,
+    construct_sum_weights,
+)
+
+
+@pytest.fixture
+def objective(tmp_path: Path) -> MultipleObjective:
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(
+        {
+            "a": rng.uniform(1.0, 2.0, 200),
+            "b": rng.uniform(1.0, 2.0, 200),
+            "c": rng.uniform(1.0, 2.0, 200),
+            "label": rng.integers(0, 2, 200),
+        }
+    )
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    objective = MultipleObjective(
+        Calculator(dataframe, ["a", "b"]),
+        direction="maximize",
+        formula="targets[0]",
+        study_path=str(tmp_path),
+        save_study=False,
+    )
+    objective.add_evaluator("auc", "label")
+    return objective
+
+
+def test_assigned_equation_type_selects_its_weights(
+    objective: MultipleObjective,
+) -> None:
+    objective.optimize(2)
+    assert objective.weights_constructor is construct_power_weights
+    objective.calculator.equation_type = "sum"
+    objective.optimize(2)
+    assert objective.weights_constructor is construct_sum_weights
+    assert set(objective.study.trials[-1].params) == {"w_fo_1", "w_fo_2"}
+
+
+def test_replaced_calculator_recounts_weights(objective: MultipleObjective) -> None:
+    objective.optimize(2)
+    calculator = Calculator(objective.calculator.df.copy(), ["a", "b", "c"])
+    objective.calculator = calculator
+    objective.optimize(2)
+    assert objective.weights_num == 3
+    assert set(objective.study.trials[-1].params) == {"w1", "w2", "w3"}
+    assert calculator.value_scales.shape == (3,)
+
+
+def _count_evaluations(
+    objective: MultipleObjective, monkeypatch: pytest.MonkeyPatch
+) -> int:
+    calls = []
+    evaluate = multiple_objective.evaluate_planned_targets
+
+    def counting_evaluate(**kwargs: object) -> np.ndarray:
+        calls.append(kwargs)
+        return evaluate(**kwargs)
+
+    monkeypatch.setattr(
+        multiple_objective, "evaluate_planned_targets", counting_evaluate
+    )
+    for _ in range(3):
+        objective.study.enqueue_trial({"w1": 0.5, "w2": -0.5})
+    objective.optimize(3)
+    return len(calls)
+
+
+def test_repeated_weights_reuse_cached_targets(
+    objective: MultipleObjective, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert _count_evaluations(objective, monkeypatch) == 1
+
+
+def test_targets_cache_can_be_disabled(
+    objective: MultipleObjective, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    objective.targets_cache_size = 0
+    assert _count_evaluations(objective, monkeypatch) == 3
+    assert not objective.targets_cache
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+
+from paradance.evaluation import Calculator
+from paradance.optimization import MultipleObjective, optimize_run
+
+
+@pytest.fixture
+def in_memory_objective(tmp_path: Path) -> MultipleObjective:
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(
+        {
+            "a": rng.uniform(1.0, 2.0, 100),
+            "b": rng.uniform(1.0, 2.0, 100),
+            "label": rng.integers(0, 2, 100),
+        }
+    )
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    objective = MultipleObjective(
+        Calculator(dataframe, ["a", "b"]),
+        direction="maximize",
+        formula="targets[0]",
+        study_path=str(tmp_path),
+        storage="memory",
+    )
+    objective.add_evaluator("auc", "label")
+    return objective
+
+
+@pytest.mark.parametrize("parallel", [False, 1])
+def test_single_worker_fills_in_memory_study(
+    in_memory_objective: MultipleObjective, parallel: int
+) -> None:
+    optimize_run(in_memory_objective, 3, parallel=parallel)
+    assert len(in_memory_objective.study.trials) == 3
+
+
+@pytest.mark.parametrize("parallel", [True, 2])
+def test_worker_processes_reject_in_memory_study(
+    in_memory_objective: MultipleObjective, parallel: int
+) -> None:
+    with pytest.raises(ValueError, match="in-memory"):
+        optimize_run(in_memory_objective, 3, parallel=parallel)
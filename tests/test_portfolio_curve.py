@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from paradance.evaluation import Calculator
+from paradance.visualization import PortfolioPlotter
+
+
+def _assert_same_curve(plotter: PortfolioPlotter, calculator: Calculator) -> None:
+    expected = PortfolioPlotter(calculator, "revenue")._curve_points([1.0, 1.0])
+    for values, expected_values in zip(plotter._curve_points([1.0, 1.0]), expected):
+        np.testing.assert_allclose(values, expected_values)
+
+
+def test_curves_follow_an_assigned_dataframe(dataframe: pd.DataFrame) -> None:
+    calculator = Calculator(dataframe, ["factor_a", "factor_b"])
+    plotter = PortfolioPlotter(calculator, "revenue")
+    plotter._curve_points([1.0, 1.0])
+    reversed_dataframe = dataframe.copy()
+    reversed_dataframe["revenue"] = dataframe["revenue"].to_numpy()[::-1]
+    calculator.df = reversed_dataframe
+    _assert_same_curve(plotter, calculator)
+
+
+def test_curves_follow_a_replaced_calculator(dataframe: pd.DataFrame) -> None:
+    plotter = PortfolioPlotter(
+        Calculator(dataframe, ["factor_a", "factor_b"]), "revenue"
+    )
+    plotter._curve_points([1.0, 1.0])
+    squared_dataframe = dataframe.copy()
+    squared_dataframe["revenue"] = dataframe["revenue"] ** 2
+    calculator = Calculator(squared_dataframe, ["factor_a", "factor_b"])
+    plotter.calculator = calculator
+    _assert_same_curve(plotter, calculator)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from paradance.evaluation import Calculator
+from paradance.evaluation.portfolio_evaluator import (
+    calculate_portfolio_concentration,
+    calculate_portfolio_concentration_batch,
+)
+
+EXPECTED_RETURNS = np.array([0.0, 0.1, 0.5, 0.8, 0.95, 0.999, 1.0])
+
+
+@pytest.mark.parametrize("mask_column", [None, "mask_half"])
+@pytest.mark.parametrize("target_column", ["revenue", "click"])
+def test_batch_matches_per_item(
+    calculator: Calculator, mask_column: str, target_column: str
+) -> None:
+    expected = np.array(
+        [
+            calculate_portfolio_concentration(
+                calculator, mask_column, target_column, expected_return=value
+            )
+            for value in EXPECTED_RETURNS
+        ],
+        dtype=np.float64,
+    )
+    thresholds, concentrations = calculate_portfolio_concentration_batch(
+        calculator, mask_column, target_column, EXPECTED_RETURNS
+    )
+    np.testing.assert_allclose(thresholds, expected[:, 0], equal_nan=True)
+    np.testing.assert_allclose(concentrations, expected[:, 1])
+
+
+def test_negative_targets_match_per_item(calculator: Calculator) -> None:
+    df = calculator.df
+    df["profit"] = df["revenue"] - 0.8
+    expected = np.array(
+        [
+            calculate_portfolio_concentration(
+                calculator, None, "profit", expected_return=value
+            )
+            for value in EXPECTED_RETURNS
+        ],
+        dtype=np.float64,
+    )
+    thresholds, concentrations = calculate_portfolio_concentration_batch(
+        calculator, None, "profit", EXPECTED_RETURNS
+    )
+    np.testing.assert_allclose(thresholds, expected[:, 0], equal_nan=True)
+    np.testing.assert_allclose(concentrations, expected[:, 1])
+
+
+def test_no_expected_returns(calculator: Calculator) -> None:
+    thresholds, concentrations = calculate_portfolio_concentration_batch(
+        calculator, None, "revenue", np.array([])
+    )
+    assert thresholds.shape == (0,)
+    assert concentrations.shape == (0,)
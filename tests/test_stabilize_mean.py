@@ -0,0 +1,138 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paradance.optimization import (
+    stabilize_mean,
+    stabilize_mean_with_additional_factors,
+    stabilize_mean_with_exponents,
+)
+from paradance.optimization.stabilize_mean import LogCache, _transformed_mean
+
+
+def _reference_exponent(
+    keep: np.ndarray,
+    fixed: np.ndarray,
+    target_mean: float,
+    low: float = 0.0,
+    high: float = 5.0,
+) -> float:
+    """Plain float64 bisection on the mean of ``keep ** exponent * fixed``."""
+    for _ in range(100):
+        mid = (low + high) / 2
+        if np.mean(keep**mid * fixed) < target_mean:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+@pytest.fixture
+def dataframe() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n_rows = 2000
+    values = rng.uniform(0.5, 2.0, size=(n_rows, 4))
+    values[::50, 0] = 0.0
+    dataframe = pd.DataFrame(values, columns=["keep_a", "keep_b", "extra", "boost"])
+    dataframe.loc[::70, "extra"] = np.nan
+    return dataframe
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def numba_path(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    if not request.param:
+        monkeypatch.setattr(stabilize_mean, "NUMBA_AVAILABLE", False)
+    return bool(request.param)
+
+
+@pytest.mark.parametrize("additional_column", ["boost", "extra"])
+def test_additional_factors_matches_reference(
+    dataframe: pd.DataFrame, additional_column: str, numba_path: bool
+) -> None:
+    keep = dataframe[["keep_a", "keep_b"]].prod(axis=1).to_numpy()
+    fixed = dataframe[[additional_column]].prod(axis=1).to_numpy()
+    expected = _reference_exponent(keep, fixed, float(np.mean(keep)))
+    result = stabilize_mean_with_additional_factors(
+        dataframe, ["keep_a", "keep_b"], [additional_column]
+    )
+    assert result == pytest.approx(expected, abs=1e-3)
+
+
+def test_exponents_matches_reference(dataframe: pd.DataFrame, numba_path: bool) -> None:
+    keep = dataframe[["keep_a", "keep_b"]].prod(axis=1).to_numpy()
+    boost = dataframe["boost"].to_numpy()
+    target_mean = float(np.mean(keep * boost)) + 0.05
+    expected = _reference_exponent(keep, boost**1.5, target_mean)
+    result = stabilize_mean_with_exponents(
+        dataframe, ["keep_a", "keep_b"], ["boost"], boost_scale=1.5, compensation=0.05
+    )
+    assert result == pytest.approx(expected, abs=1e-3)
+
+
+def test_log_cache_is_reused(dataframe: pd.DataFrame) -> None:
+    log_cache: LogCache = {}
+    expected = stabilize_mean_with_additional_factors(
+        dataframe, ["keep_a", "keep_b"], ["extra"]
+    )
+    first = stabilize_mean_with_additional_factors(
+        dataframe, ["keep_a", "keep_b"], ["extra"], log_cache=log_cache
+    )
+    assert set(log_cache) == {
+        (id(dataframe), column) for column in ["keep_a", "keep_b", "extra"]
+    }
+    second = stabilize_mean_with_additional_factors(
+        dataframe, ["keep_a", "keep_b"], ["extra"], log_cache=log_cache
+    )
+    assert first == second == expected
+
+
+def test_log_cache_ignores_reused_frame_ids() -> None:
+    rng = np.random.default_rng(1)
+    log_cache: LogCache = {}
+    for _ in range(50):
+        # Each frame is freed after its iteration, so CPython hands its id to the next.
+        dataframe = pd.DataFrame(
+            rng.uniform(0.5, 2.0, size=(100, 2)), columns=["keep", "extra"]
+        )
+        expected = stabilize_mean_with_additional_factors(
+            dataframe, ["keep"], ["extra"]
+        )
+        assert stabilize_mean_with_additional_factors(
+            dataframe, ["keep"], ["extra"], log_cache=log_cache
+        ) == pytest.approx(expected)
+
+
+def test_log_cache_of_resized_frame_raises(dataframe: pd.DataFrame) -> None:
+    log_cache: LogCache = {
+        (id(dataframe), "keep_a"): (
+            weakref.ref(dataframe),
+            np.zeros(len(dataframe) - 1),
+        )
+    }
+    with pytest.raises(ValueError, match="log_cache"):
+        stabilize_mean_with_additional_factors(
+            dataframe, ["keep_a"], ["extra"], log_cache=log_cache
+        )
+
+
+def test_negative_values_raise(dataframe: pd.DataFrame) -> None:
+    dataframe.loc[3, "extra"] = -1.0
+    with pytest.raises(ValueError, match="extra"):
+        stabilize_mean_with_additional_factors(dataframe, ["keep_a"], ["extra"])
+
+
+def test_zero_exponent_keeps_zero_rows(numba_path: bool) -> None:
+    keep_log_sum = np.array([-np.inf, np.log(2.0), np.log(4.0)], dtype=np.float32)
+    fixed_log_sum = np.log(np.array([1.0, 2.0, 3.0], dtype=np.float32))
+    assert _transformed_mean(0.0, keep_log_sum, fixed_log_sum) == pytest.approx(2.0)
+    assert _transformed_mean(1.0, keep_log_sum, fixed_log_sum) == pytest.approx(16 / 3)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_empty_dataframe(dataframe: pd.DataFrame) -> None:
+    result = stabilize_mean_with_additional_factors(
+        dataframe.iloc[:0], ["keep_a"], ["extra"], low=0.0, high=5.0
+    )
+    assert 0.0 <= result <= 5.0
@@ -0,0 +1,82 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from paradance.evaluation import Calculator
+from paradance.evaluation.wuauc_evaluator import calculate_wuauc, calculate_wuauc_batch
+
+
+def _per_item(
+    calculator: Calculator,
+    target_columns: List[str],
+    mask_columns: List[Optional[str]],
+    groupbys: List[Optional[str]],
+    weights_for_groups: List[Optional[pd.Series]],
+    auc: bool = False,
+) -> List[float]:
+    return [
+        calculate_wuauc(
+            calculator,
+            mask_column,
+            target_column,
+            groupby=groupby,
+            weights_for_groups=weights,
+            auc=auc,
+        )
+        for target_column, mask_column, groupby, weights in zip(
+            target_columns, mask_columns, groupbys, weights_for_groups
+        )
+    ]
+
+
+def test_auc_batch_matches_per_item(calculator: Calculator) -> None:
+    args = (
+        ["click", "like", "click"],
+        [None, None, "mask_half"],
+        [None] * 3,
+        [None] * 3,
+    )
+    expected = _per_item(calculator, *args, auc=True)
+    assert calculate_wuauc_batch(calculator, *args, auc=True) == pytest.approx(expected)
+
+
+def test_wuauc_batch_matches_per_item(calculator: Calculator) -> None:
+    user_weights = calculator.df.groupby("user").size().astype(float)
+    args = (
+        ["click", "like", "click", "like"],
+        [None, "mask_half", "mask_half", None],
+        ["user"] * 4,
+        [None, user_weights, None, user_weights],
+    )
+    expected = _per_item(calculator, *args)
+    assert calculate_wuauc_batch(calculator, *args) == pytest.approx(expected)
+
+
+def test_wuauc_batch_skips_groups_removed_by_mask(calculator: Calculator) -> None:
+    df = calculator.df
+    df["mask_users"] = (df["user"] >= 3).astype(int)
+    user_weights = df.groupby("user").size().astype(float)
+    args = (["click", "like"], ["mask_users"] * 2, ["user"] * 2, [user_weights] * 2)
+    expected = _per_item(calculator, *args)
+    assert calculate_wuauc_batch(calculator, *args) == pytest.approx(expected)
+
+
+def test_wuauc_batch_single_class_group(calculator: Calculator) -> None:
+    df = calculator.df
+    df.loc[df["user"] == 0, "click"] = 1
+    args = (["click", "like"], [None] * 2, ["user"] * 2, [None] * 2)
+    expected = _per_item(calculator, *args)
+    with pytest.warns(Warning):
+        results = calculate_wuauc_batch(calculator, *args)
+    np.testing.assert_allclose(results, expected, equal_nan=True)
+
+
+def test_wuauc_batch_requires_groupby(calculator: Calculator) -> None:
+    with pytest.raises(ValueError):
+        calculate_wuauc_batch(calculator, ["click"], [None], [None], [None])
+
+
+def test_wuauc_batch_empty(calculator: Calculator) -> None:
+    assert calculate_wuauc_batch(calculator, [], [], [], []) == []